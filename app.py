@@ -1,7 +1,10 @@
 import dash
-from dash import html
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 
+import data_loader as dl
+from profiling import init_profiling
+
 # Initialize the Dash app
 app = dash.Dash(__name__,
                 external_stylesheets=[
@@ -10,12 +13,22 @@ app = dash.Dash(__name__,
                 ],
                 suppress_callback_exceptions=True,
                 use_pages=True)
+# Opt-in per-request profiling, see profiling.py
+init_profiling(app.server)
+# Hot reload of the dataset when its file changes
+if dl.RELOAD_INTERVAL:
+    dl.watch(float(dl.RELOAD_INTERVAL))
 # Main app layout with basic routing structure
 app.layout = html.Div([
     # dcc.Location(id='url', refresh=False),
     html.H1(
         html.A("Data Management Dashboard", href="/", className="text-decoration-none text-dark"),
         className="mb-4"),
+    html.Div([
+        dcc.Link("Positions", href="/", className="me-3"),
+        dcc.Link("Breaks", href="/breaks", className="me-3"),
+        dcc.Link("Summary", href="/summary", className="me-3"),
+    ], className="mb-4"),
     dash.page_container
 ])
 
@@ -46,6 +59,16 @@ app.index_string = '''
             .ag-row-selected {
                 --ag-selected-row-background-color: #e3f2fd !important;
             }
+            .diff-changed {
+                background-color: #fff3cd !important;
+            }
+            .diff-added {
+                background-color: #e8f5e9 !important;
+            }
+            .diff-removed {
+                color: #9e9e9e;
+                text-decoration: line-through;
+            }
         </style>
     </head>
     <body>
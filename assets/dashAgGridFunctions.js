@@ -0,0 +1,11 @@
+// dash_multi_tab_dashboard/assets/dashAgGridFunctions.js
+var dagfuncs = (window.dashAgGridFunctions = window.dashAgGridFunctions || {});
+
+// Report the currently open column groups back to Dash, so the server only
+// ships the columns of the groups being viewed.
+dagfuncs.openColumnGroups = function (params, setEventData) {
+    const openGroups = params.api.getColumnGroupState()
+        .filter(group => group.open)
+        .map(group => group.groupId);
+    setEventData({openColumnGroups: openGroups});
+};
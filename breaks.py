@@ -0,0 +1,236 @@
+# dash_multi_tab_dashboard/breaks.py
+import copy
+
+import numpy as np
+import pandas as pd
+
+
+# Rolling window (in business dates) the RTPL - CleanPnL baseline is computed over
+DEFAULT_WINDOW = 20
+# Fewer prior observations than this leaves a row unscored
+DEFAULT_MIN_PERIODS = 5
+# Rows whose |z-score| reaches this are flagged as breaks
+DEFAULT_THRESHOLD = 3.0
+
+SCORE_COLUMNS = ['Position ID', 'Business Date', 'Asset Type', 'CleanPnL', 'RTPL',
+                 'Diff', 'Mean', 'Std', 'Z']
+
+# Aggregates of the Asset Type x Business Date heatmap
+HEATMAP_METRICS = {
+    'sum': 'Sum of RTPL - CleanPnL',
+    'max_abs': 'Max |RTPL - CleanPnL|',
+    'breaks': 'Number of breaks',
+}
+
+
+def date_digests(df):
+    """
+    {Business Date: (rows, hash)} of the columns scores are computed from. The
+    hash is a wrapping sum of row hashes, so it does not depend on row order.
+    """
+    hashes = pd.util.hash_pandas_object(df[SCORE_COLUMNS[:5]], index=False)
+    grouped = hashes.groupby(df['Business Date'].to_numpy()).agg(['size', 'sum'])
+    return {date: (int(rows), int(total)) for date, rows, total in grouped.itertuples()}
+
+
+def trailing_stats(values, starts, rows, window, min_periods, chunk_rows=50_000):
+    """
+    Mean and standard deviation of the `window` values before each of `rows`,
+    not reaching back past the first row of its group (`starts`). NaN where
+    fewer than `min_periods` of those values are present.
+    """
+    mean = np.full(len(values), np.nan)
+    std = np.full(len(values), np.nan)
+    lags = np.arange(1, window + 1)
+    for lo in range(0, len(rows), chunk_rows):
+        rows_chunk = rows[lo:lo + chunk_rows]
+        prev = rows_chunk[:, None] - lags
+        windows = np.where(prev >= starts[rows_chunk, None], values[np.maximum(prev, 0)], np.nan)
+        present = ~np.isnan(windows)
+        count = present.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mu = np.nansum(windows, axis=1) / count
+            var = np.nansum((windows - mu[:, None]) ** 2, axis=1) / (count - 1)
+        scored = count >= max(min_periods, 2)
+        mean[rows_chunk] = np.where(count >= min_periods, mu, np.nan)
+        std[rows_chunk] = np.where(scored, np.sqrt(var), np.nan)
+    return mean, std
+
+
+class BreakDetector:
+    """
+    Screens every position for RTPL vs CleanPnL breaks.
+
+    Each row's `Diff = RTPL - CleanPnL` is scored against the rolling mean/std of
+    the same position's previous `window` diffs. All positions are scored together
+    with one vectorized pass. Only the last `window` rows of each position are
+    retained between updates, so feeding a new business date through `update`
+    scores it without rescanning the history, also on a `copy` of the detector.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, min_periods=DEFAULT_MIN_PERIODS,
+                 threshold=DEFAULT_THRESHOLD):
+        self.window = window
+        self.min_periods = min_periods
+        self.threshold = threshold
+        # Retained tail of each position's diffs, and every row scored so far
+        self.history = None
+        self._score_parts = []
+        self._last_date = None
+        # date_digests of the rows scored on each date, to tell whether a date was restated
+        self.digests = {}
+        self._flagged = None
+        self._heatmap = None
+
+    def update(self, df):
+        """Score the rows of `df`, typically the rows of newly arrived business dates"""
+        new = df[SCORE_COLUMNS[:5]].copy()
+        new['Diff'] = new['RTPL'] - new['CleanPnL']
+        self.digests.update(date_digests(new))
+
+        frame = new.assign(_new=True)
+        if self.history is not None:
+            frame = pd.concat([self.history.assign(_new=False), frame], ignore_index=True)
+        # A re-delivered (position, date) replaces the retained one
+        frame = (
+            frame
+            .drop_duplicates(['Position ID', 'Business Date'], keep='last')
+            .sort_values(['Position ID', 'Business Date'], kind='mergesort')
+            .reset_index(drop=True)
+        )
+
+        # Baseline from the previous rows only, so a break does not dilute itself
+        ids = frame['Position ID'].to_numpy()
+        first = np.ones(len(frame), dtype=bool)
+        first[1:] = ids[1:] != ids[:-1]
+        starts = np.maximum.accumulate(np.where(first, np.arange(len(frame)), 0))
+        # Only the new rows are scored, the retained ones just feed their windows
+        mean, std = trailing_stats(
+            frame['Diff'].to_numpy(dtype=float, na_value=np.nan), starts,
+            np.flatnonzero(frame['_new'].to_numpy()), self.window, self.min_periods
+        )
+        frame['Mean'] = mean
+        frame['Std'] = np.where(std > 0, std, np.nan)
+        frame['Z'] = (frame['Diff'] - frame['Mean']) / frame['Std']
+
+        scored = frame.loc[frame['_new'], SCORE_COLUMNS].reset_index(drop=True)
+        if self._score_parts and scored['Business Date'].min() <= self._last_date:
+            # Re-scored dates replace the earlier scores
+            scored_all = pd.concat([self.scores, scored], ignore_index=True)
+            self._score_parts = [
+                scored_all
+                .drop_duplicates(['Position ID', 'Business Date'], keep='last')
+                .reset_index(drop=True)
+            ]
+        elif len(scored):
+            # New dates only, appended and concatenated once when read
+            self._score_parts.append(scored)
+        if len(scored):
+            self._last_date = max(self._last_date or '', scored['Business Date'].max())
+        self.history = (
+            frame.groupby('Position ID', sort=False).tail(self.window)[SCORE_COLUMNS[:6]]
+            .reset_index(drop=True)
+        )
+        self._flagged = None
+        self._heatmap = None
+        return scored
+
+    def copy(self):
+        """A detector with the same state, that can be updated without changing this one"""
+        other = copy.copy(self)
+        other._score_parts = list(self._score_parts)
+        other.digests = dict(self.digests)
+        return other
+
+    @property
+    def last_date(self):
+        """Latest Business Date scored so far (None before the first update)"""
+        return self._last_date
+
+    @property
+    def scores(self):
+        """Every row scored so far"""
+        if not self._score_parts:
+            return None
+        if len(self._score_parts) > 1:
+            self._score_parts = [pd.concat(self._score_parts, ignore_index=True)]
+        return self._score_parts[0]
+
+    @property
+    def nbytes(self):
+        """Memory held by the scores and the retained tail"""
+        frames = list(self._score_parts) + ([self.history] if self.history is not None else [])
+        return int(sum(x.memory_usage(deep=True).sum() for x in frames))
+
+    @property
+    def business_dates(self):
+        if self.scores is None:
+            return []
+        return sorted(self.scores['Business Date'].unique(), reverse=True)
+
+    def flagged(self, business_date=None):
+        """Flagged rows, largest |z-score| first, optionally for a single business date"""
+        if self.scores is None:
+            return pd.DataFrame(columns=SCORE_COLUMNS)
+        if self._flagged is None:
+            _scores = self.scores.dropna(subset=['Z'])
+            _scores = _scores[_scores['Z'].abs() >= self.threshold]
+            self._flagged = _scores.reindex(
+                _scores['Z'].abs().sort_values(ascending=False).index
+            ).reset_index(drop=True)
+
+        if business_date is None:
+            return self._flagged
+        return self._flagged[self._flagged['Business Date'] == business_date]
+
+    def heatmap(self):
+        """
+        Every scored row binned into an Asset Type x Business Date grid: one
+        frame per HEATMAP_METRICS entry plus the row count, with NaN for
+        empty buckets (and for the diff aggregates of buckets whose diffs are
+        all missing).
+        """
+        if self._heatmap is None:
+            self._heatmap = self._aggregate()
+        return self._heatmap
+
+    def _aggregate(self):
+        scores = self.scores if self.scores is not None else pd.DataFrame(columns=SCORE_COLUMNS)
+        types, type_labels = pd.factorize(scores['Asset Type'], sort=True)
+        dates, date_labels = pd.factorize(scores['Business Date'], sort=True)
+        shape = (len(type_labels), len(date_labels))
+
+        # Flat bucket number of each row, then one bincount per aggregate
+        keep = (types >= 0) & (dates >= 0)
+        bins = (types * shape[1] + dates)[keep]
+        diff = scores['Diff'].to_numpy(dtype=float, na_value=np.nan)[keep]
+        z = scores['Z'].to_numpy(dtype=float, na_value=np.nan)[keep]
+        valid = ~np.isnan(diff)
+
+        size = shape[0] * shape[1]
+        rows = np.bincount(bins, minlength=size)
+        # Buckets without a single valid diff have no diff aggregates (NaN, not 0)
+        no_diff = np.bincount(bins[valid], minlength=size) == 0
+        total = np.bincount(bins[valid], weights=diff[valid], minlength=size)
+        total[no_diff] = np.nan
+        max_abs = np.full(size, np.nan)
+        np.fmax.at(max_abs, bins[valid], np.abs(diff[valid]))
+        breaks = np.bincount(bins, weights=np.abs(z) >= self.threshold, minlength=size)
+
+        index = pd.Index(type_labels, name='Asset Type')
+        columns = pd.Index(date_labels, name='Business Date')
+        result = {}
+        for name, values in (('sum', total), ('max_abs', max_abs), ('breaks', breaks), ('rows', rows)):
+            values = values.astype(float)
+            values[rows == 0] = np.nan
+            result[name] = pd.DataFrame(values.reshape(shape), index=index, columns=columns)
+        return result
+
+    def bucket(self, asset_type, business_date):
+        """Scored rows of one heatmap bucket, largest |RTPL - CleanPnL| first"""
+        if self.scores is None:
+            return pd.DataFrame(columns=SCORE_COLUMNS)
+        rows = self.scores[
+            (self.scores['Asset Type'] == asset_type) & (self.scores['Business Date'] == business_date)
+        ]
+        return rows.reindex(rows['Diff'].abs().sort_values(ascending=False).index).reset_index(drop=True)
@@ -0,0 +1,72 @@
+# dash_multi_tab_dashboard/column_schema.py
+import pandas as pd
+
+
+# Columns identifying a row. These are always shipped to the grids, whichever
+# column groups are expanded.
+KEY_COLUMNS = ['Position ID', 'Business Date', 'Asset Type']
+
+# Column families in display order, with the prefix the detail card uses to
+# recognize them. 'Basic' also carries CleanPnL on top of the Meta columns.
+COLUMN_GROUP_PREFIXES = {
+    'Basic': 'Meta',
+    'Clean PnL': 'Pnl',
+    'RTPL': 'RTPL',
+    'Settings': 'Settings',
+}
+
+
+def column_type(dtype):
+    """AG Grid column type for a pandas dtype"""
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'numericColumn'
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'dateColumn'
+    return 'textColumn'
+
+
+class ColumnSchema:
+    """
+    Registry of the dataset columns, grouped into the families shown on the
+    detail card. Built once at load time and shared by every grid.
+    """
+
+    def __init__(self, df):
+        self.key_columns = [x for x in KEY_COLUMNS if x in df.columns]
+        self.groups = {name: [] for name in COLUMN_GROUP_PREFIXES}
+        if 'CleanPnL' in df.columns:
+            self.groups['Basic'].append('CleanPnL')
+
+        for col in df.columns:
+            if col in self.key_columns or col == 'CleanPnL':
+                continue
+            for name, prefix in COLUMN_GROUP_PREFIXES.items():
+                if col.startswith(prefix):
+                    self.groups[name].append(col)
+                    break
+            else:
+                # Keep unrecognized columns reachable rather than dropping them
+                self.groups.setdefault('Other', []).append(col)
+
+        self.types = {col: column_type(dtype) for col, dtype in zip(df.columns, df.dtypes)}
+
+    def columns(self, groups=None):
+        """Key columns followed by the columns of the given groups (all groups if None)"""
+        if groups is None:
+            groups = self.groups.keys()
+        cols = list(self.key_columns)
+        for name in self.groups:
+            if name in groups:
+                cols.extend(self.groups[name])
+        return cols
+
+    def numeric_columns(self, groups=None):
+        """Numeric columns of the given groups (all groups if None)"""
+        return [
+            x for x in self.columns(groups)
+            if x not in self.key_columns and self.types.get(x) == 'numericColumn'
+        ]
+
+    def project(self, df, groups=None):
+        """Restrict a frame to the key columns plus the given groups"""
+        return df[[x for x in self.columns(groups) if x in df.columns]]
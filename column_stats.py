@@ -0,0 +1,212 @@
+# dash_multi_tab_dashboard/column_stats.py
+import math
+
+import numpy as np
+import pandas as pd
+
+
+# Sketch size: larger k means tighter quantiles and more memory (rank error is
+# roughly 1.7 / k^0.9, about 2% at the default)
+DEFAULT_K = 128
+
+# Rows of the summary are partitioned on these, so any Asset Type and date
+# range can be answered by merging partitions
+PARTITION_COLUMNS = ['Business Date', 'Asset Type']
+
+SUMMARY_QUANTILES = {'P1': 0.01, 'P50': 0.5, 'P99': 0.99}
+SUMMARY_COLUMNS = ['Column', 'Count', 'Nulls', 'Min', 'P1', 'P50', 'Mean', 'P99', 'Max']
+
+_rng = np.random.default_rng()
+
+
+class QuantileSketch:
+    """
+    KLL quantile sketch of a stream of numbers.
+
+    Items are kept in levels; an item at level h stands for 2^h of the original
+    values. When a level outgrows its capacity it is sorted and every other item
+    (from a random offset) is promoted to the level above. Sketches merge by
+    concatenating their levels and compacting again, so the sketch of a union of
+    partitions is built without looking at the raw values.
+    """
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so that weights are preserved
+                keep = items[:len(items) % 2]
+                items = items[len(keep):]
+                self.levels[level + 1] = np.concatenate(
+                    [self.levels[level + 1], items[_rng.integers(2)::2]]
+                )
+                self.levels[level] = keep
+                # The new level shrinks the capacities below it, recheck from the bottom
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values):
+        """Add an array of values, NaNs excluded"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    @classmethod
+    def merged(cls, sketches, k=DEFAULT_K):
+        """One sketch summarizing all of `sketches`, which are left unchanged"""
+        result = cls(k)
+        depth = max((len(x.levels) for x in sketches), default=1)
+        result.levels = [
+            np.concatenate([x.levels[h] for x in sketches if h < len(x.levels)] or [np.empty(0)])
+            for h in range(depth)
+        ]
+        result.n = sum(x.n for x in sketches)
+        result._compress()
+        return result
+
+    def quantiles(self, qs):
+        """Approximate values at the quantiles `qs` (NaN if empty)"""
+        if not self.n:
+            return np.full(len(qs), np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(x), 2.0 ** h) for h, x in enumerate(self.levels)])
+        order = np.argsort(items, kind='mergesort')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(qs, dtype=float) * cumulative[-1]
+        return items[np.minimum(np.searchsorted(cumulative, ranks), len(items) - 1)]
+
+    @property
+    def nbytes(self):
+        return sum(x.nbytes for x in self.levels)
+
+
+class ColumnSummary:
+    """Count, nulls, sum, min, max and a quantile sketch of one column, mergeable"""
+
+    def __init__(self, k=DEFAULT_K):
+        self.count = 0
+        self.nulls = 0
+        self.total = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.sketch = QuantileSketch(k)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        valid = values[~np.isnan(values)]
+        self.nulls += len(values) - len(valid)
+        if len(valid):
+            self.count += len(valid)
+            self.total += float(valid.sum())
+            self.min = np.fmin(self.min, valid.min())
+            self.max = np.fmax(self.max, valid.max())
+            self.sketch.update(valid)
+        return self
+
+    @classmethod
+    def merged(cls, summaries, k=DEFAULT_K):
+        result = cls(k)
+        for x in summaries:
+            result.count += x.count
+            result.nulls += x.nulls
+            result.total += x.total
+            result.min = np.fmin(result.min, x.min)
+            result.max = np.fmax(result.max, x.max)
+        result.sketch = QuantileSketch.merged([x.sketch for x in summaries], k)
+        return result
+
+    def result(self):
+        quantiles = self.sketch.quantiles(list(SUMMARY_QUANTILES.values()))
+        stats = {
+            'Count': self.count,
+            'Nulls': self.nulls,
+            'Min': self.min,
+            'Mean': self.total / self.count if self.count else np.nan,
+            'Max': self.max,
+        }
+        stats.update(zip(SUMMARY_QUANTILES, quantiles))
+        return stats
+
+
+class ColumnStats:
+    """
+    Distribution summaries of numeric columns, kept per (Business Date, Asset
+    Type) partition.
+
+    `update` takes a frame holding the partition columns and any of the
+    summarized columns, so the dataset can be streamed in one column at a time.
+    `summary` answers for an Asset Type and a date range by merging the
+    partition summaries; the raw rows are never read again.
+    """
+
+    def __init__(self, columns, k=DEFAULT_K):
+        self.columns = list(columns)
+        self.k = k
+        self.partitions = {}  # (business date, asset type) -> {column: ColumnSummary}
+
+    def update(self, df):
+        columns = [x for x in self.columns if x in df.columns]
+        dates, date_keys = pd.factorize(df[PARTITION_COLUMNS[0]])
+        types, type_keys = pd.factorize(df[PARTITION_COLUMNS[1]])
+        codes = dates * len(type_keys) + types
+
+        # Group the rows by partition once, then slice every column the same way.
+        # Rows missing a partition key are left out.
+        order = np.argsort(codes, kind='stable')
+        order = order[(dates[order] >= 0) & (types[order] >= 0)]
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        keys = [
+            (date_keys[code // len(type_keys)], type_keys[code % len(type_keys)])
+            for code in codes[order[np.concatenate([[0], bounds])]]
+        ] if len(order) else []
+
+        for col in columns:
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)[order]
+            for key, rows in zip(keys, np.split(values, bounds)):
+                partition = self.partitions.setdefault(key, {})
+                partition.setdefault(col, ColumnSummary(self.k)).update(rows)
+        return self
+
+    @property
+    def business_dates(self):
+        return sorted({x[0] for x in self.partitions})
+
+    @property
+    def asset_types(self):
+        return sorted({x[1] for x in self.partitions})
+
+    def summary(self, asset_type=None, start=None, end=None):
+        """One row of statistics per column over the matching partitions"""
+        selected = [
+            partition for (business_date, partition_type), partition in self.partitions.items()
+            if (asset_type is None or partition_type == asset_type)
+            and (start is None or business_date >= start)
+            and (end is None or business_date <= end)
+        ]
+        rows = []
+        for col in self.columns:
+            summaries = [x[col] for x in selected if col in x]
+            rows.append({'Column': col, **ColumnSummary.merged(summaries, self.k).result()})
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+    @property
+    def nbytes(self):
+        return sum(x.sketch.nbytes for partition in self.partitions.values() for x in partition.values())
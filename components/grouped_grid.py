@@ -0,0 +1,88 @@
+# dash_multi_tab_dashboard/components/grouped_grid.py
+import dash_ag_grid as dag
+
+
+def make_column_def(col_name, col_type, **kwargs):
+    col_def = {
+        'field': col_name,
+        'id': col_name.lower().replace(' ', '_'),
+        'headerName': col_name,
+        'type': col_type,
+        'width': 150
+    }
+    col_def.update(kwargs)
+    return col_def
+
+
+def make_grouped_column_defs(schema):
+    """
+    Build AG Grid column definitions with one collapsible group per column family.
+    Key columns stay pinned on the left; each group starts collapsed and only
+    shows a placeholder column until it is opened.
+    """
+    columnDefs = [
+        make_column_def(col, schema.types[col], pinned='left')
+        for col in schema.key_columns
+    ]
+    for name, cols in schema.groups.items():
+        if not cols:
+            continue
+        children = [{
+            'headerName': f'{len(cols)} columns',
+            'colId': f'{name}-collapsed',
+            'columnGroupShow': 'closed',
+            'sortable': False,
+            'filter': False,
+            'width': 120,
+        }]
+        children += [
+            make_column_def(col, schema.types[col], columnGroupShow='open')
+            for col in cols
+        ]
+        columnDefs.append({
+            'headerName': name,
+            'groupId': name,
+            'openByDefault': False,
+            'children': children,
+        })
+    return columnDefs
+
+
+def expanded_groups(event_data):
+    """Column groups currently open in a grid, as reported through its eventData"""
+    if not event_data or not isinstance(event_data.get('data'), dict):
+        return []
+    return event_data['data'].get('openColumnGroups', [])
+
+
+def make_grouped_grid(grid_id, schema, df=None, **kwargs):
+    """
+    AG Grid over `df` showing the column families of `schema` as collapsible
+    groups. Only key columns are shipped initially; a callback on the grid's
+    `eventData` should send the columns of a group once it is expanded.
+    Without `df` no rows are included, e.g. for the infinite row model.
+    """
+    grid_kwargs = dict(
+        id=grid_id,
+        columnDefs=make_grouped_column_defs(schema),
+        defaultColDef={
+            'resizable': True,
+            'sortable': True,
+            'filter': True,
+        },
+        getRowId="params.data['Position ID'] + '|' + params.data['Business Date']",
+        eventListeners={'columnGroupOpened': ['openColumnGroups(params, setEventData)']},
+        dashGridOptions={
+            'rowSelection': 'single',
+            'suppressRowClickSelection': False,
+            'animateRows': True,
+            'pagination': True,
+            'paginationPageSize': 15,
+        },
+        style={'height': '500px', 'width': '100%'},
+        className="ag-theme-alpine"
+    )
+    if df is not None:
+        grid_kwargs['rowData'] = schema.project(df, groups=[]).to_dict('records')
+    grid_kwargs.update(kwargs)
+    return dag.AgGrid(**grid_kwargs)
@@ -1,6 +1,269 @@
 # dash_multi_tab_dashboard/data_loader.py
+import glob
+import logging
+import os
+import threading
+import weakref
+from concurrent.futures import Future
 import pandas as pd
 import time # For simulating delay
 
+from column_schema import ColumnSchema
+from breaks import BreakDetector, SCORE_COLUMNS, date_digests
+from column_stats import ColumnStats, PARTITION_COLUMNS
+from data_sources import MemorySource, open_source
+from history_store import HistoryStore
+from position_index import PositionIndex
+from snapshot_diff import DIFF_BATCH_ROWS, diff_scans
 
-df = pd.read_csv("./financial_dataset_2025-06-01.csv")
+
+# Dataset file; other financial_dataset_* files next to it can be diffed against it
+DATA_FILE = os.environ.get('DASHBOARD_DATA_FILE', "./financial_dataset_2025-06-01.csv")
+
+# Serve from an on-disk data source instead (parquet:///, sqlite:/// or
+# duckdb:/// URL, see data_sources). Unset serves DATA_FILE from memory.
+DATA_SOURCE = os.environ.get('DASHBOARD_DATA_SOURCE')
+
+# Memory budget (MB) for the resident history of the in-memory source.
+# Business dates beyond it are spilled to memory-mapped files under
+# DASHBOARD_SPILL_DIR (a temporary directory if unset). Leaving it unset
+# keeps the whole history resident.
+MEMORY_BUDGET_MB = os.environ.get('DASHBOARD_MEMORY_BUDGET_MB')
+SPILL_DIR = os.environ.get('DASHBOARD_SPILL_DIR')
+MEMORY_BUDGET_BYTES = float(MEMORY_BUDGET_MB) * 2**20 if MEMORY_BUDGET_MB else None
+
+# Seconds between checks of the data file for changes; unset disables hot reload
+RELOAD_INTERVAL = os.environ.get('DASHBOARD_RELOAD_INTERVAL')
+
+logger = logging.getLogger(__name__)
+
+
+class Dataset:
+    """
+    One loaded version of the dataset, with everything precomputed from it.
+    A Dataset is never modified once published through `current()`.
+
+    Given the `previous` version, the break detector carries on from that
+    version's state and only scores the business dates after its last one.
+    This only holds if the dates it already scored come back unchanged (same
+    rows, same values, none dropped); a restated date means a full rescore.
+    """
+
+    def __init__(self, source, version, previous=None):
+        self.source = source
+        self.version = version
+
+        # Column families of the dataset, shared by the detail card and the grids
+        self.column_schema = ColumnSchema(source.schema())
+
+        # Everything below is computed in one pass over the history, a few
+        # business dates at a time, so loading never holds it all in memory
+        numeric_columns = self.column_schema.numeric_columns()
+        columns = list(dict.fromkeys(SCORE_COLUMNS[:5] + PARTITION_COLUMNS + numeric_columns))
+        # Book-wide RTPL vs CleanPnL break screen
+        if previous is not None:
+            self.break_detector = previous.break_detector.copy()
+        else:
+            self.break_detector = BreakDetector()
+        scored_until = self.break_detector.last_date
+        digests = {}
+        # Distribution summaries of the numeric columns
+        self.column_stats = ColumnStats(numeric_columns)
+        latest = None
+        for part in source.scan(columns=columns):
+            if scored_until is None:
+                new = part
+            else:
+                scored = part['Business Date'] <= scored_until
+                digests.update(date_digests(part[scored]))
+                new = part[~scored]
+            if len(new):
+                self.break_detector.update(new)
+            self.column_stats.update(part)
+            latest = latest_dates(part if latest is None else pd.concat([latest, part[latest.columns]]))
+
+        if scored_until is not None and digests != previous.break_detector.digests:
+            logger.info("Scored business dates were restated, rescoring the whole book")
+            self.break_detector = BreakDetector()
+            for part in source.scan(columns=SCORE_COLUMNS[:5]):
+                self.break_detector.update(part)
+
+        # Type-ahead search over every Position ID
+        self.position_index = PositionIndex(latest if latest is not None else source.schema())
+
+        # Held in memory for the lifetime of the version, on top of any memory budget
+        self.derived_bytes = {
+            'break_scores': self.break_detector.nbytes,
+            'column_stats': self.column_stats.nbytes,
+        }
+        logger.info("Dataset v%s derived data: %s", version, self.derived_bytes)
+
+        self.loaded_at = time.time()
+        self._diffs = {}
+        self._diffs_lock = threading.Lock()
+
+    def snapshot_diff(self, name):
+        """Diff of this dataset against the snapshot file `name` (the older version), see `snapshot_files`"""
+        path = snapshot_path(name)
+        key = (path, os.path.getmtime(path))
+        # The first request for a key computes the diff, concurrent ones wait for its result
+        with self._diffs_lock:
+            future = self._diffs.get(key)
+            owner = future is None
+            if owner:
+                future = self._diffs[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            # Both versions are streamed a few business dates at a time
+            baseline = open_snapshot(path)
+            try:
+                diff = diff_scans(
+                    baseline.scan(batch_rows=DIFF_BATCH_ROWS), self.source.scan(batch_rows=DIFF_BATCH_ROWS),
+                    baseline.schema(), self.source.schema()
+                )
+            finally:
+                baseline.close()
+        except Exception as e:
+            with self._diffs_lock:
+                self._diffs.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        future.set_result(diff)
+        with self._diffs_lock:
+            # Only the latest snapshot's diff is kept
+            self._diffs = {k: v for k, v in self._diffs.items() if k == key or not v.done()}
+        return diff
+
+    def describe(self):
+        return (
+            f"Dataset v{self.version} loaded {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.loaded_at))}"
+            f" | {self.source.describe()}"
+            f" | break scores {self.derived_bytes['break_scores'] / 2**20:.1f} MB"
+            f", column sketches {self.derived_bytes['column_stats'] / 2**20:.1f} MB"
+        )
+
+
+def latest_dates(df):
+    """Latest Business Date of each position"""
+    return (
+        df[['Position ID', 'Business Date']]
+        .sort_values('Business Date', kind='mergesort')
+        .drop_duplicates('Position ID', keep='last')
+    )
+
+
+def open_dataset_source(version):
+    if DATA_SOURCE:
+        return open_source(DATA_SOURCE)
+    # Full history, with the older dates spilled once over the memory budget.
+    # Each version spills to its own directory, as the previous one may still be in use.
+    return MemorySource(HistoryStore.read_csv(
+        DATA_FILE,
+        budget_bytes=MEMORY_BUDGET_BYTES,
+        spill_dir=os.path.join(SPILL_DIR, f'v{version}') if SPILL_DIR else None,
+    ))
+
+
+def open_snapshot(path):
+    """Data source over a snapshot file, under the same memory budget as the dataset"""
+    if path.endswith('.parquet'):
+        return open_source(f'parquet:///{path}')
+    return MemorySource(HistoryStore.read_csv(
+        path, budget_bytes=MEMORY_BUDGET_BYTES
+    ))
+
+
+def _release(version, source):
+    source.close()
+    logger.info("Released dataset v%s", version)
+
+
+def load_dataset(version, previous=None):
+    dataset = Dataset(open_dataset_source(version), version, previous)
+    # Close the source once no request holds this version any more
+    weakref.finalize(dataset, _release, version, dataset.source)
+    return dataset
+
+
+# The dataset being served. Readers take one reference with `current()` per
+# request and use it throughout, so they always see a consistent version;
+# `reload` builds the next version aside and publishes it with a single
+# reference assignment, so the read path takes no locks.
+_current = load_dataset(1)
+_reload_lock = threading.Lock()
+
+
+def current():
+    return _current
+
+
+def reload():
+    """Build the next dataset version and swap it in once complete"""
+    global _current
+    with _reload_lock:
+        started = time.time()
+        dataset = load_dataset(_current.version + 1, previous=_current)
+        _current = dataset
+    logger.info("Loaded dataset v%s in %.1fs", dataset.version, time.time() - started)
+    return dataset
+
+
+def reload_async():
+    """Reload in a background thread while requests keep being served"""
+    thread = threading.Thread(target=reload, name='dataset-reload', daemon=True)
+    thread.start()
+    return thread
+
+
+def _data_signature():
+    """(modification time, size) of the data file, or of the newest file and total size of a directory"""
+    path = DATA_SOURCE.partition(':///')[2] if DATA_SOURCE else DATA_FILE
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+    stats = [os.stat(os.path.join(root, x)) for root, _, files in os.walk(path) for x in files]
+    return max((x.st_mtime for x in stats), default=0), sum(x.st_size for x in stats)
+
+
+def watch(interval):
+    """
+    Poll the data file every `interval` seconds and reload when it changes.
+    A change is only picked up once the file looks the same on two polls in a
+    row, so a file still being written is not loaded half way.
+    """
+    def _watch():
+        loaded = previous = _data_signature()
+        while True:
+            time.sleep(interval)
+            try:
+                signature = _data_signature()
+                if signature != loaded and signature == previous:
+                    loaded = signature
+                    reload()
+                previous = signature
+            except Exception:
+                logger.exception("Dataset reload failed, still serving v%s", _current.version)
+
+    thread = threading.Thread(target=_watch, name='dataset-watch', daemon=True)
+    thread.start()
+    return thread
+
+
+def snapshot_files():
+    """Other versions of the dataset that can be diffed against the loaded one"""
+    pattern = os.path.join(os.path.dirname(DATA_FILE) or '.', 'financial_dataset_*')
+    return sorted(
+        x for x in glob.glob(pattern)
+        if x.endswith(('.csv', '.parquet')) and os.path.abspath(x) != os.path.abspath(DATA_FILE)
+    )
+
+
+def snapshot_path(name):
+    """Path of the snapshot file called `name`; only files listed by `snapshot_files` are served"""
+    for path in snapshot_files():
+        if os.path.basename(path) == name:
+            return path
+    raise KeyError(f"Unknown snapshot {name!r}")
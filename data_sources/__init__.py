@@ -0,0 +1,38 @@
+# dash_multi_tab_dashboard/data_sources/__init__.py
+from data_sources.base import DataSource
+from data_sources.memory import MemorySource
+
+
+def open_source(url, **kwargs):
+    """
+    Open an on-disk data source from its URL:
+
+        parquet:///path/to/dir-or-file
+        sqlite:///path/to/file.db
+        duckdb:///path/to/file.duckdb
+
+    Paths are relative to the working directory; use four slashes for an
+    absolute path (sqlite:////data/book.db), as with SQLAlchemy URLs.
+    Backends are imported lazily, so pyarrow and duckdb are only needed when used.
+    """
+    scheme, _, path = url.partition(':///')
+    if scheme == 'parquet':
+        from data_sources.parquet import ParquetSource
+        return ParquetSource(path, **kwargs)
+    elif scheme in ('sqlite', 'duckdb'):
+        from data_sources.sql import SqlSource
+        return SqlSource(url, **kwargs)
+    raise ValueError(f"Unsupported data source {url!r}")
+
+
+def write_source(df, url):
+    """Write a dataset to the on-disk format of a data source URL"""
+    scheme, _, path = url.partition(':///')
+    if scheme == 'parquet':
+        from data_sources.parquet import ParquetSource
+        ParquetSource.write(df, path)
+    elif scheme in ('sqlite', 'duckdb'):
+        from data_sources.sql import SqlSource
+        SqlSource.write(df, url)
+    else:
+        raise ValueError(f"Unsupported data source {url!r}")
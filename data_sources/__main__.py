@@ -0,0 +1,18 @@
+# dash_multi_tab_dashboard/data_sources/__main__.py
+"""
+Convert a dataset CSV into a data source the dashboard can serve from.
+
+    python -m data_sources financial_dataset_2025-06-01.csv sqlite:///book.db
+    python -m data_sources financial_dataset_2025-06-01.csv parquet:///book_parquet
+"""
+import sys
+
+import pandas as pd
+
+from data_sources import write_source
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    write_source(pd.read_csv(sys.argv[1]), sys.argv[2])
@@ -0,0 +1,195 @@
+# dash_multi_tab_dashboard/data_sources/base.py
+"""
+Data-source interface shared by the backends.
+
+Filters are passed down as predicates so each backend can evaluate them in its
+own engine. A predicate is either a leaf
+
+    {'column': 'CleanPnL', 'op': '>', 'value': 0}
+
+with op one of ==, !=, <, <=, >, >=, between (value is a (low, high) pair),
+the case-insensitive iequals, not_iequals, contains, not_contains, startswith
+and endswith, is_null and not_null; or a combination {'and': [...]} or
+{'or': [...]}. A list of predicates means all of them.
+"""
+import json
+import threading
+from collections import OrderedDict
+
+
+# Aggregation functions every backend supports
+AGGREGATIONS = ('sum', 'mean', 'min', 'max', 'count')
+
+# Rows per frame yielded by DataSource.scan
+DEFAULT_SCAN_ROWS = 200_000
+
+_TEXT_OPS = {
+    'equals': '==',
+    'notEqual': '!=',
+    'contains': 'contains',
+    'notContains': 'not_contains',
+    'startsWith': 'startswith',
+    'endsWith': 'endswith',
+    'lessThan': '<',
+    'lessThanOrEqual': '<=',
+    'greaterThan': '>',
+    'greaterThanOrEqual': '>=',
+    'inRange': 'between',
+    'blank': 'is_null',
+    'notBlank': 'not_null',
+}
+
+
+def _condition_predicate(column, condition):
+    op = _TEXT_OPS.get(condition.get('type'))
+    if op is None:
+        raise ValueError(f"Unsupported filter type {condition.get('type')!r} on {column!r}")
+
+    if condition.get('filterType') == 'date':
+        value = (condition.get('dateFrom') or '')[:10]
+        value_to = (condition.get('dateTo') or '')[:10]
+    else:
+        value = condition.get('filter')
+        value_to = condition.get('filterTo')
+    if op == 'between':
+        value = (value, value_to)
+    if op in ('==', '!=') and condition.get('filterType', 'text') == 'text':
+        # AG Grid text filters are case-insensitive
+        op = 'iequals' if op == '==' else 'not_iequals'
+    return {'column': column, 'op': op, 'value': value}
+
+
+def predicates_from_filter_model(filter_model):
+    """Translate an AG Grid filter model into predicates"""
+    predicates = []
+    for column, model in (filter_model or {}).items():
+        if 'conditions' in model:
+            combined = [_condition_predicate(column, x) for x in model['conditions']]
+            predicates.append({model.get('operator', 'AND').lower(): combined})
+        else:
+            predicates.append(_condition_predicate(column, model))
+    return predicates
+
+
+def sort_keys(sort_model):
+    """(column, ascending) pairs from an AG Grid sort model"""
+    return [(x['colId'], x.get('sort', 'asc') == 'asc') for x in (sort_model or [])]
+
+
+def predicate_columns(filters):
+    """Columns referenced by a list of predicates"""
+    columns = []
+    for predicate in filters or []:
+        if 'column' in predicate:
+            columns.append(predicate['column'])
+        else:
+            columns.extend(predicate_columns(predicate.get('and', []) + predicate.get('or', [])))
+    return list(dict.fromkeys(columns))
+
+
+def key_predicates(position_id, business_date=None):
+    predicates = [{'column': 'Position ID', 'op': '==', 'value': position_id}]
+    if business_date is not None:
+        predicates.append({'column': 'Business Date', 'op': '==', 'value': business_date})
+    return predicates
+
+
+def date_range_predicates(first, last):
+    return [{'column': 'Business Date', 'op': 'between', 'value': (first, last)}]
+
+
+def model_key(*models):
+    """Hashable key of AG Grid sort/filter models"""
+    return json.dumps(models, sort_keys=True)
+
+
+class ResultCache:
+    """
+    Least recently used results of per-request work that depends only on the
+    grid models (row orders, counts), shared by the threads serving the grid.
+    A source's data never changes, so entries never go stale.
+    """
+
+    def __init__(self, size=16):
+        self.size = size
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        result = compute()
+
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.size:
+                self._results.popitem(last=False)
+        return result
+
+
+class DataSource:
+    """
+    Read access to the dataset. Every operation takes an optional `columns`
+    projection and returns a DataFrame with those columns only.
+    """
+
+    def schema(self):
+        """Empty frame with the dataset's columns and dtypes"""
+        raise NotImplementedError
+
+    def frame(self, columns=None, filters=None):
+        """All rows matching `filters`"""
+        raise NotImplementedError
+
+    def page(self, start, end, sort_model=None, filter_model=None, columns=None):
+        """Rows [start, end) of the grid after AG Grid's sort and filter models, and the total row count"""
+        raise NotImplementedError
+
+    def aggregate(self, by, metrics, filters=None):
+        """
+        Group by the `by` columns and reduce: metrics maps a column to a list
+        of AGGREGATIONS, giving one `<column>_<function>` column each.
+        """
+        raise NotImplementedError
+
+    def scan(self, columns=None, batch_rows=DEFAULT_SCAN_ROWS):
+        """
+        Every row, in frames of whole business dates (about `batch_rows` rows
+        each), oldest dates first. Load-time passes over the dataset use this
+        so they never hold the full history at once.
+        """
+        counts = self.aggregate(['Business Date'], {'Position ID': ['count']})
+        dates, rows = [], 0
+        for business_date, n in zip(counts['Business Date'], counts['Position ID_count']):
+            dates.append(business_date)
+            rows += n
+            if rows >= batch_rows:
+                yield self.frame(columns, date_range_predicates(dates[0], dates[-1]))
+                dates, rows = [], 0
+        if dates:
+            yield self.frame(columns, date_range_predicates(dates[0], dates[-1]))
+
+    def position_history(self, position_id, columns=None):
+        """Every row of a position, oldest first"""
+        fetch = columns if columns is None or 'Business Date' in columns else columns + ['Business Date']
+        df = (
+            self.frame(columns=fetch, filters=key_predicates(position_id))
+            .sort_values('Business Date', kind='mergesort')
+            .reset_index(drop=True)
+        )
+        return df if columns is None else df[columns]
+
+    def row(self, position_id, business_date, columns=None):
+        """The row of a position on one business date, as a one-row frame"""
+        return self.frame(columns=columns, filters=key_predicates(position_id, business_date)) \
+            .reset_index(drop=True)
+
+    def describe(self):
+        """One line describing what is being served"""
+        return type(self).__name__
+
+    def close(self):
+        pass
@@ -0,0 +1,176 @@
+# dash_multi_tab_dashboard/data_sources/memory.py
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from data_sources.base import (
+    DEFAULT_SCAN_ROWS, DataSource, ResultCache, model_key, predicate_columns, predicates_from_filter_model,
+    sort_keys
+)
+
+
+def _text(series):
+    return series.astype('string').str.lower()
+
+
+def predicate_mask(df, predicate):
+    """Boolean mask of the rows of `df` matching a predicate"""
+    if 'and' in predicate:
+        return reduce(np.logical_and, (predicate_mask(df, x) for x in predicate['and']))
+    if 'or' in predicate:
+        return reduce(np.logical_or, (predicate_mask(df, x) for x in predicate['or']))
+
+    col = df[predicate['column']]
+    op, value = predicate['op'], predicate['value']
+    if op == '==':
+        return col == value
+    elif op == '!=':
+        return col != value
+    elif op == '<':
+        return col < value
+    elif op == '<=':
+        return col <= value
+    elif op == '>':
+        return col > value
+    elif op == '>=':
+        return col >= value
+    elif op == 'between':
+        return (col >= value[0]) & (col <= value[1])
+    elif op == 'is_null':
+        return col.isna()
+    elif op == 'not_null':
+        return col.notna()
+
+    text, value = _text(col), str(value).lower()
+    if op == 'iequals':
+        mask = text == value
+    elif op == 'not_iequals':
+        mask = text != value
+    elif op == 'contains':
+        mask = text.str.contains(value, regex=False)
+    elif op == 'not_contains':
+        mask = ~text.str.contains(value, regex=False)
+    elif op == 'startswith':
+        mask = text.str.startswith(value)
+    elif op == 'endswith':
+        mask = text.str.endswith(value)
+    else:
+        raise ValueError(f"Unsupported predicate op {op!r}")
+    return mask.fillna(op.startswith('not_')).astype(bool)
+
+
+def apply_predicates(df, filters):
+    if not filters:
+        return df
+    return df[reduce(np.logical_and, (predicate_mask(df, x) for x in filters))]
+
+
+def order_frame(df, sort_model=None, filter_model=None):
+    """Row positions of `df` after applying AG Grid's filter and sort models"""
+    filters = predicates_from_filter_model(filter_model)
+    if filters:
+        positions = np.flatnonzero(
+            reduce(np.logical_and, (np.asarray(predicate_mask(df, x)) for x in filters))
+        )
+    else:
+        positions = np.arange(len(df))
+
+    keys = sort_keys(sort_model)
+    if keys:
+        ordered = (
+            df.iloc[positions][[x[0] for x in keys]]
+            .reset_index(drop=True)
+            .sort_values([x[0] for x in keys], ascending=[x[1] for x in keys], kind='mergesort')
+        )
+        positions = positions[ordered.index.to_numpy()]
+    return positions
+
+
+class MemorySource(DataSource):
+    """
+    The dataset held in memory by a HistoryStore, typically read from CSV.
+
+    Grid pages cover the whole history: a sort or filter is evaluated over the
+    resident rows and the spilled dates (paged in a few at a time, only the
+    columns it needs), and each block then pages in just the dates it shows.
+    The row order of recent sort/filter combinations is cached, so paging
+    through a sorted grid does not re-sort the history for every block.
+    """
+
+    ORDER_CACHE_SIZE = 16
+
+    def __init__(self, store):
+        self.store = store
+        self._orders = ResultCache(self.ORDER_CACHE_SIZE)
+
+    def schema(self):
+        return self.store.resident.iloc[:0]
+
+    def frame(self, columns=None, filters=None):
+        fetch = None if columns is None else list(dict.fromkeys(columns + predicate_columns(filters)))
+        df = apply_predicates(self.store.frame(columns=fetch), filters)
+        return df if columns is None else df[columns]
+
+    def position_history(self, position_id, columns=None):
+        return self.store.position_history(position_id, columns=columns)
+
+    def row(self, position_id, business_date, columns=None):
+        df = self.store.row(position_id, business_date)
+        return df if columns is None else df[columns]
+
+    def scan(self, columns=None, batch_rows=DEFAULT_SCAN_ROWS):
+        # The resident rows are already in memory and come as one frame
+        return self.store.scan(columns=columns, batch_rows=batch_rows)
+
+    def _history_order(self, sort_model, filter_model):
+        """Row positions of the history (in HistoryStore.scan order) after filtering and sorting"""
+        keys = [x[0] for x in sort_keys(sort_model)]
+        fetch = list(dict.fromkeys(keys + predicate_columns(predicates_from_filter_model(filter_model))))
+        if not fetch:
+            return np.arange(len(self.store))
+
+        # Filter every batch as it is paged in, keeping the sort columns of the matches only
+        positions, matches, offset = [], [], 0
+        for df in self.store.scan(columns=fetch, batch_rows=DEFAULT_SCAN_ROWS):
+            rows = order_frame(df, filter_model=filter_model)
+            positions.append(rows + offset)
+            matches.append(df.iloc[rows][keys])
+            offset += len(df)
+        positions = np.concatenate(positions)
+        if keys:
+            matches = pd.concat(matches, ignore_index=True)
+            positions = positions[order_frame(matches, sort_model)]
+        return positions
+
+    def _order(self, sort_model, filter_model):
+        return self._orders.get(
+            model_key(sort_model, filter_model), lambda: self._history_order(sort_model, filter_model)
+        )
+
+    def page(self, start, end, sort_model=None, filter_model=None, columns=None):
+        positions = self._order(sort_model, filter_model)
+        return self.store.take(positions[start:end], columns=columns), len(positions)
+
+    def aggregate(self, by, metrics, filters=None):
+        columns = list(dict.fromkeys(by + list(metrics) + predicate_columns(filters)))
+        df = apply_predicates(self.store.frame(columns=columns), filters)
+        result = df.groupby(by, sort=True).agg(metrics)
+        result.columns = [f'{col}_{func}' for col, func in result.columns]
+        return result.reset_index()
+
+    def describe(self):
+        report = self.store.memory_report()
+        status = (
+            f"{len(self.store.resident):,} rows resident over {report['resident_dates']} business dates "
+            f"({report['resident_bytes'] / 2**20:.1f} MB)"
+        )
+        if report['spilled_dates']:
+            status += (
+                f"; {report['spilled_dates']} older dates spilled "
+                f"({report['spilled_bytes'] / 2**20:.1f} MB on disk, {report['page_ins']} page-ins)"
+            )
+        return status
+
+    def close(self):
+        self.store.close()
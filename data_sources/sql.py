@@ -0,0 +1,203 @@
+# dash_multi_tab_dashboard/data_sources/sql.py
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+
+from data_sources.base import DataSource, ResultCache, model_key, predicates_from_filter_model, sort_keys
+
+
+DEFAULT_TABLE = 'positions'
+
+_COMPARISONS = {'==': '=', '!=': '<>', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+_LIKE_PATTERNS = {
+    'contains': '%{}%',
+    'not_contains': '%{}%',
+    'startswith': '{}%',
+    'endswith': '%{}',
+}
+
+
+def quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def predicate_sql(predicate, params):
+    """SQL condition for a predicate, appending its parameters to `params`"""
+    for combine in ('and', 'or'):
+        if combine in predicate:
+            parts = [predicate_sql(x, params) for x in predicate[combine]]
+            return '(' + f' {combine.upper()} '.join(parts) + ')'
+
+    col = quote(predicate['column'])
+    op, value = predicate['op'], predicate['value']
+    if op in _COMPARISONS:
+        params.append(value)
+        return f'{col} {_COMPARISONS[op]} ?'
+    elif op == 'between':
+        params.extend(value)
+        return f'{col} BETWEEN ? AND ?'
+    elif op == 'is_null':
+        return f'{col} IS NULL'
+    elif op == 'not_null':
+        return f'{col} IS NOT NULL'
+    elif op in ('iequals', 'not_iequals'):
+        params.append(str(value).lower())
+        condition = f'lower(CAST({col} AS VARCHAR)) = ?'
+        return f'NOT COALESCE({condition}, FALSE)' if op == 'not_iequals' else condition
+    elif op in _LIKE_PATTERNS:
+        params.append(_LIKE_PATTERNS[op].format(_escape_like(str(value).lower())))
+        condition = f"lower(CAST({col} AS VARCHAR)) LIKE ? ESCAPE '\\'"
+        return f'NOT COALESCE({condition}, FALSE)' if op == 'not_contains' else condition
+    raise ValueError(f"Unsupported predicate op {op!r}")
+
+
+def where_sql(filters, params):
+    if not filters:
+        return ''
+    return ' WHERE ' + ' AND '.join(predicate_sql(x, params) for x in filters)
+
+
+class SqlSource(DataSource):
+    """
+    A table in an embedded SQL database: SQLite (`sqlite:///path.db`) or DuckDB
+    (`duckdb:///path.duckdb`, needs the duckdb package).
+
+    Filters, sorting, paging, projection and aggregation are all compiled into
+    the query, so only the requested rows and columns leave the engine.
+    Connections are kept in a pool and reused across requests, and the row
+    counts of recent grid filters are cached so paging runs one query per block.
+    """
+
+    COUNT_CACHE_SIZE = 16
+
+    def __init__(self, url, table=DEFAULT_TABLE, pool_size=8):
+        self.dialect, _, self.path = url.partition(':///')
+        if self.dialect not in ('sqlite', 'duckdb'):
+            raise ValueError(f"Unsupported SQL data source {url!r}")
+        self.url = url
+        self.table = quote(table)
+        self.pool_size = pool_size
+        self._counts = ResultCache(self.COUNT_CACHE_SIZE)
+        self._open()
+        self._schema = self.query(f'SELECT * FROM {self.table} LIMIT 1000').iloc[:0]
+
+    @classmethod
+    def write(cls, df, url, table=DEFAULT_TABLE):
+        dialect, _, path = url.partition(':///')
+        df = df.sort_values(['Position ID', 'Business Date'], kind='mergesort')
+        if dialect == 'duckdb':
+            import duckdb
+            con = duckdb.connect(path)
+            con.register('_df', df)
+            con.execute(f'CREATE OR REPLACE TABLE {quote(table)} AS SELECT * FROM _df')
+        else:
+            con = sqlite3.connect(path)
+            df.to_sql(table, con, if_exists='replace', index=False, chunksize=10000)
+            con.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_position" '
+                        f'ON {quote(table)} ("Position ID", "Business Date")')
+            con.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_date" ON {quote(table)} ("Business Date")')
+            con.commit()
+        con.close()
+
+    def _open(self):
+        self._pid = os.getpid()
+        self._pool = queue.LifoQueue()
+        if self.dialect == 'duckdb':
+            import duckdb
+            self._db = duckdb.connect(self.path, read_only=True)
+
+    def _connect(self):
+        if self.dialect == 'duckdb':
+            return self._db.cursor()
+        # Pooled connections move between threads, but only one uses them at a time
+        return sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+
+    @contextmanager
+    def _connection(self):
+        if os.getpid() != self._pid:
+            # Connections do not survive a fork, a forked worker opens its own
+            self._open()
+        try:
+            con = self._pool.get_nowait()
+        except queue.Empty:
+            con = self._connect()
+        try:
+            yield con
+        finally:
+            if self._pool.qsize() < self.pool_size:
+                self._pool.put(con)
+            else:
+                con.close()
+
+    def query(self, sql, params=()):
+        with self._connection() as con:
+            if self.dialect == 'duckdb':
+                return con.execute(sql, list(params)).df()
+            return pd.read_sql_query(sql, con, params=list(params))
+
+    def _select(self, columns):
+        return ', '.join(quote(x) for x in columns) if columns is not None else '*'
+
+    def schema(self):
+        return self._schema
+
+    def frame(self, columns=None, filters=None):
+        params = []
+        where = where_sql(filters, params)
+        return self.query(f'SELECT {self._select(columns)} FROM {self.table}{where}', params)
+
+    def position_history(self, position_id, columns=None):
+        return self.query(
+            f'SELECT {self._select(columns)} FROM {self.table} '
+            f'WHERE "Position ID" = ? ORDER BY "Business Date"',
+            [position_id]
+        )
+
+    def page(self, start, end, sort_model=None, filter_model=None, columns=None):
+        params = []
+        where = where_sql(predicates_from_filter_model(filter_model), params)
+        total = self._counts.get(
+            model_key(filter_model),
+            lambda: int(self.query(f'SELECT COUNT(*) AS n FROM {self.table}{where}', params)['n'].iloc[0])
+        )
+
+        # rowid last breaks ties in table order, so tied rows keep their place
+        # from one block to the next (the other sources sort stably)
+        order = ', '.join(
+            [f"{quote(col)} {'ASC' if asc else 'DESC'} NULLS LAST" for col, asc in sort_keys(sort_model)]
+            + ['rowid']
+        )
+        df = self.query(
+            f'SELECT {self._select(columns)} FROM {self.table}{where} ORDER BY {order} LIMIT ? OFFSET ?',
+            params + [max(end - start, 0), start]
+        )
+        return df, total
+
+    def aggregate(self, by, metrics, filters=None):
+        params = []
+        where = where_sql(filters, params)
+        functions = {'sum': 'SUM', 'mean': 'AVG', 'min': 'MIN', 'max': 'MAX', 'count': 'COUNT'}
+        select = [quote(x) for x in by] + [
+            f'{functions[func]}({quote(col)}) AS {quote(f"{col}_{func}")}'
+            for col, funcs in metrics.items() for func in funcs
+        ]
+        group = ', '.join(quote(x) for x in by)
+        return self.query(
+            f'SELECT {", ".join(select)} FROM {self.table}{where} GROUP BY {group} ORDER BY {group}', params
+        )
+
+    def describe(self):
+        return f"{self.dialect} table {self.table} in {self.path}"
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+        if self.dialect == 'duckdb':
+            self._db.close()
@@ -0,0 +1,336 @@
+# dash_multi_tab_dashboard/history_store.py
+import atexit
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# Rows per chunk when a CSV is streamed into the store
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+class SpilledPartition:
+    """
+    One business date written to disk as one .npy file per column, read back
+    through memory maps. Numeric and datetime columns are stored as they are;
+    other columns are stored as fixed-width unicode with a separate null mask.
+    Rows can be appended later as further segments, e.g. while a file is read
+    in chunks.
+    """
+
+    def __init__(self, df, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.columns = list(df.columns)
+        self.segments = []  # (row count, {column: stored raw}, {column: dtype}) per segment
+        self.nbytes = 0
+        self.append(df)
+
+    def append(self, df):
+        segment = len(self.segments)
+        raw, dtypes = {}, {}
+        for i, col in enumerate(self.columns):
+            series = df[col]
+            dtypes[col] = str(series.dtype)
+            raw[col] = isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM'
+            if raw[col]:
+                self._save(i, segment, series.to_numpy())
+            else:
+                self._save(i, segment, series.isna().to_numpy(), suffix='mask')
+                self._save(i, segment, series.fillna('').astype(str).to_numpy(dtype=str))
+        self.segments.append((len(df), raw, dtypes))
+
+        with open(os.path.join(self.path, 'columns.json'), 'w') as f:
+            json.dump({'columns': self.columns, 'segments': self.segments}, f)
+
+    def __len__(self):
+        return sum(x[0] for x in self.segments)
+
+    def _file(self, i, segment, suffix='values'):
+        return os.path.join(self.path, f'c{i:04d}.s{segment:04d}.{suffix}.npy')
+
+    def _save(self, i, segment, arr, suffix='values'):
+        np.save(self._file(i, segment, suffix), arr, allow_pickle=False)
+        self.nbytes += arr.nbytes
+
+    def _load(self, i, segment, suffix='values'):
+        return np.load(self._file(i, segment, suffix), mmap_mode='r')
+
+    def find(self, col, value):
+        """Row numbers where `col` equals `value`, scanning only that column"""
+        i = self.columns.index(col)
+        rows, offset = [], 0
+        for segment, (n, _, _) in enumerate(self.segments):
+            rows.append(np.flatnonzero(self._load(i, segment) == value) + offset)
+            offset += n
+        return np.concatenate(rows)
+
+    def read(self, columns=None, rows=None):
+        """Page the partition in, restricted to some columns and rows if given"""
+        parts, offset = [], 0
+        for segment, (n, raw, dtypes) in enumerate(self.segments):
+            segment_rows = None
+            if rows is not None:
+                segment_rows = rows[(rows >= offset) & (rows < offset + n)] - offset
+            offset += n
+            if segment_rows is not None and not len(segment_rows) and parts:
+                continue
+            parts.append(self._read_segment(segment, raw, dtypes, columns, segment_rows))
+        return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+    def _read_segment(self, segment, raw, dtypes, columns, rows):
+        data = {}
+        for col in columns or self.columns:
+            i = self.columns.index(col)
+            values = self._load(i, segment)
+            values = values[rows] if rows is not None else values
+            if raw[col]:
+                data[col] = np.array(values)
+            else:
+                mask = self._load(i, segment, suffix='mask')
+                mask = mask[rows] if rows is not None else mask
+                values = values.astype(object)
+                values[mask] = np.nan
+                data[col] = pd.Series(values).astype(dtypes[col])
+        return pd.DataFrame(data)
+
+
+class HistoryStore:
+    """
+    Dataset history held under a memory budget.
+
+    The most recent business dates that fit into `budget_bytes` stay resident as
+    a regular, fully typed DataFrame (`resident`). Older dates are spilled to
+    memory-mapped column files under `spill_dir` and only paged in when a query
+    reaches back that far. Without a budget everything stays resident.
+    """
+
+    def __init__(self, df=None, budget_bytes=None, spill_dir=None):
+        self.budget_bytes = budget_bytes
+        self.spill_dir = None
+        self._owns_spill_dir = False
+        self.spilled = {}  # business date -> SpilledPartition
+        self.spills = 0
+        self.page_ins = 0
+
+        self.resident = None
+        if df is None:
+            # Filled by read_csv
+            return
+        if budget_bytes is None:
+            self.resident = df
+        else:
+            self.resident = self._apply_budget(df, spill_dir)
+        self._loaded()
+
+    @classmethod
+    def read_csv(cls, path, budget_bytes=None, spill_dir=None, chunksize=DEFAULT_CHUNK_ROWS):
+        """
+        Load a CSV under the budget. The file is read in chunks and the rows of
+        spilled dates are written out as each chunk arrives, so the full history
+        is never held in memory.
+        """
+        if budget_bytes is None:
+            return cls(pd.read_csv(path))
+
+        # A first pass over the date column alone sizes every business date
+        date_rows = pd.read_csv(path, usecols=['Business Date'])['Business Date'].value_counts()
+        store = cls(budget_bytes=budget_bytes)
+
+        resident, spill_dates = [], None
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            if spill_dates is None:
+                row_bytes = chunk.memory_usage(deep=True).sum() / max(len(chunk), 1)
+                spill_dates = store._spill_dates(date_rows * row_bytes)
+                if spill_dates:
+                    store._open_spill_dir(spill_dir)
+            spill_mask = chunk['Business Date'].isin(spill_dates)
+            store._spill(chunk[spill_mask])
+            resident.append(chunk[~spill_mask])
+
+        store.resident = pd.concat(resident, ignore_index=True) if resident else pd.read_csv(path, nrows=0)
+        store._loaded()
+        return store
+
+    def _loaded(self):
+        self.resident_bytes = int(self.resident.memory_usage(deep=True).sum())
+        logger.info("History store: %s", self.memory_report())
+
+    def _spill_dates(self, date_bytes):
+        """Dates beyond the budget, given the estimated footprint of every date"""
+        date_bytes = date_bytes.sort_index(ascending=False)
+        # Newest dates first, always keeping at least the latest one resident
+        fits = date_bytes.cumsum() <= self.budget_bytes
+        if len(fits):
+            fits.iloc[0] = True
+        return set(date_bytes.index[~fits])
+
+    def _open_spill_dir(self, spill_dir):
+        if spill_dir is None:
+            spill_dir = tempfile.mkdtemp(prefix='dashboard-spill-')
+            atexit.register(shutil.rmtree, spill_dir, ignore_errors=True)
+            self._owns_spill_dir = True
+        elif not os.path.exists(spill_dir):
+            os.makedirs(spill_dir)
+            self._owns_spill_dir = True
+        self.spill_dir = spill_dir
+
+    def _spill(self, df):
+        for business_date, part in df.groupby('Business Date'):
+            part = part.reset_index(drop=True)
+            if business_date in self.spilled:
+                self.spilled[business_date].append(part)
+            else:
+                self.spilled[business_date] = SpilledPartition(
+                    part, os.path.join(self.spill_dir, f'p{len(self.spilled):05d}')
+                )
+            self.spills += 1
+
+    def _apply_budget(self, df, spill_dir):
+        # Per-date footprint estimated from the average row size
+        row_bytes = df.memory_usage(deep=True).sum() / max(len(df), 1)
+        spill_dates = self._spill_dates(df['Business Date'].value_counts() * row_bytes)
+        if not spill_dates:
+            return df
+
+        self._open_spill_dir(spill_dir)
+        spill_mask = df['Business Date'].isin(spill_dates)
+        self._spill(df[spill_mask])
+        return df[~spill_mask].reset_index(drop=True)
+
+    @property
+    def business_dates(self):
+        return sorted(set(self.resident['Business Date']) | set(self.spilled), reverse=True)
+
+    def _page_in(self, partition, columns=None, rows=None):
+        self.page_ins += 1
+        return partition.read(columns=columns, rows=rows)
+
+    def frame(self, since=None, columns=None):
+        """All rows on or after `since` (the whole history if None)"""
+        parts = [
+            self._page_in(partition, columns=columns)
+            for business_date, partition in sorted(self.spilled.items())
+            if since is None or business_date >= since
+        ]
+        resident = self.resident
+        if since is not None:
+            resident = resident[resident['Business Date'] >= since]
+        if columns is not None:
+            resident = resident[columns]
+        return pd.concat(parts + [resident], ignore_index=True) if parts else resident
+
+    def scan(self, columns=None, batch_rows=None):
+        """
+        The whole history, oldest first, in frames of whole business dates of
+        about `batch_rows` rows (one spilled date per frame and the resident
+        rows in one frame if None): spilled dates are paged in a few at a
+        time, then come the resident rows
+        """
+        batch, rows = [], 0
+        for business_date, partition in sorted(self.spilled.items()):
+            batch.append(self._page_in(partition, columns=columns))
+            rows += len(partition)
+            if batch_rows is None or rows >= batch_rows:
+                yield pd.concat(batch, ignore_index=True) if len(batch) > 1 else batch[0]
+                batch, rows = [], 0
+        if batch:
+            yield pd.concat(batch, ignore_index=True) if len(batch) > 1 else batch[0]
+
+        resident = self.resident if columns is None else self.resident[columns]
+        if batch_rows is None or len(resident) <= batch_rows:
+            yield resident
+            return
+        date_rows = resident['Business Date'].value_counts().sort_index()
+        batch_of = (date_rows.cumsum() - 1) // batch_rows
+        for _, dates in date_rows.index.to_series().groupby(batch_of.to_numpy()):
+            yield resident[resident['Business Date'].isin(dates)].reset_index(drop=True)
+
+    def __len__(self):
+        return len(self.resident) + sum(len(x) for x in self.spilled.values())
+
+    def take(self, positions, columns=None):
+        """
+        Rows at `positions` of the history in `scan` order (spilled dates oldest
+        first, then the resident rows), in the order given. Only the spilled
+        dates holding one of the rows are paged in.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        parts = [partition for _, partition in sorted(self.spilled.items())] + [None]
+        starts = np.cumsum([0] + [len(x) for x in parts[:-1]])
+        which = np.searchsorted(starts, positions, side='right') - 1
+
+        frames, picked = [], []
+        for k in np.unique(which):
+            selected = np.flatnonzero(which == k)
+            # Partitions read their rows in stored order, the page order is restored below
+            selected = selected[np.argsort(positions[selected], kind='stable')]
+            rows = positions[selected] - starts[k]
+            if parts[k] is None:
+                frame = self.resident.iloc[rows]
+                frame = frame if columns is None else frame[columns]
+            else:
+                frame = self._page_in(parts[k], columns=columns, rows=rows)
+            frames.append(frame)
+            picked.append(selected)
+
+        if not frames:
+            resident = self.resident.iloc[:0]
+            return resident if columns is None else resident[columns]
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].reset_index(drop=True)
+        return df.iloc[np.argsort(np.concatenate(picked), kind='stable')].reset_index(drop=True)
+
+    def position_history(self, position_id, columns=None):
+        """Every row of a position, oldest first"""
+        parts = []
+        for business_date, partition in sorted(self.spilled.items()):
+            rows = partition.find('Position ID', position_id)
+            if len(rows):
+                parts.append(self._page_in(partition, columns=columns, rows=rows))
+
+        resident = self.resident[self.resident['Position ID'] == position_id]
+        if columns is not None:
+            resident = resident[columns]
+        if not parts:
+            return resident
+        return (
+            pd.concat(parts + [resident], ignore_index=True)
+            .sort_values('Business Date', kind='mergesort')
+            .reset_index(drop=True)
+        )
+
+    def row(self, position_id, business_date):
+        """The row of a position on one business date, as a one-row frame"""
+        partition = self.spilled.get(business_date)
+        if partition is None:
+            return self.resident[
+                (self.resident['Position ID'] == position_id)
+                & (self.resident['Business Date'] == business_date)
+            ].reset_index(drop=True)
+        return self._page_in(partition, rows=partition.find('Position ID', position_id))
+
+    def memory_report(self):
+        return {
+            'budget_bytes': self.budget_bytes,
+            'resident_bytes': self.resident_bytes,
+            'resident_dates': int(self.resident['Business Date'].nunique()),
+            'spilled_dates': len(self.spilled),
+            'spilled_bytes': sum(x.nbytes for x in self.spilled.values()),
+            'spills': self.spills,
+            'page_ins': self.page_ins,
+        }
+
+    def close(self):
+        """Delete the spilled partitions, and the spill directory if the store created it"""
+        for partition in self.spilled.values():
+            shutil.rmtree(partition.path, ignore_errors=True)
+        if self._owns_spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+        self.spilled = {}
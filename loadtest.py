@@ -0,0 +1,228 @@
+# dash_multi_tab_dashboard/loadtest.py
+"""
+Local load test for the dashboard.
+
+Each simulated session follows a typical user flow: open the home page,
+select a row in the data table, open that position's detail page and go back
+to hit "Refresh Data". Sessions run concurrently and the per-endpoint
+throughput and latency percentiles are reported at the end.
+
+    # In-process, through the Flask test client
+    python loadtest.py --sessions 8 --iterations 20
+
+    # Against a running server
+    python loadtest.py --url http://127.0.0.1:8050 --sessions 32
+"""
+import argparse
+import http.client
+import json
+import math
+import random
+import threading
+import time
+import urllib.parse
+from collections import defaultdict
+
+
+UPDATE_COMPONENT = '/_dash-update-component'
+
+
+class TestClientSession:
+    """Requests sent in-process through the Flask test client"""
+
+    def __init__(self, server):
+        self.client = server.test_client()
+
+    def request(self, method, path, payload=None):
+        response = self.client.open(path, method=method, json=payload)
+        return response.status_code, response.get_data()
+
+
+class HttpSession:
+    """Requests sent over one keep-alive HTTP connection"""
+
+    def __init__(self, url):
+        parsed = urllib.parse.urlparse(url)
+        self.conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=60)
+
+    def request(self, method, path, payload=None):
+        body, headers = None, {}
+        if payload is not None:
+            body = json.dumps(payload)
+            headers['Content-Type'] = 'application/json'
+        self.conn.request(method, path, body=body, headers=headers)
+        response = self.conn.getresponse()
+        return response.status, response.read()
+
+
+def callback_payload(outputs, inputs, state=(), changed=()):
+    """Body of a Dash callback request, mimicking what the renderer sends"""
+    outputs = [{'id': x.split('.')[0], 'property': x.split('.')[1]} for x in outputs]
+    if len(outputs) == 1:
+        output = f"{outputs[0]['id']}.{outputs[0]['property']}"
+    else:
+        output = '..' + '...'.join(f"{x['id']}.{x['property']}" for x in outputs) + '..'
+    return {
+        'output': output,
+        'outputs': outputs if len(outputs) > 1 else outputs[0],
+        'inputs': [{'id': i, 'property': p, 'value': v} for i, p, v in inputs],
+        'state': [{'id': i, 'property': p, 'value': v} for i, p, v in state],
+        'changedPropIds': list(changed),
+    }
+
+
+def page_payload(pathname):
+    return callback_payload(
+        ['_pages_content.children', '_pages_store.data'],
+        [('_pages_location', 'pathname', pathname), ('_pages_location', 'search', '')],
+        changed=['_pages_location.pathname'],
+    )
+
+
+def rows_payload(start=0, end=100):
+    """A block request of the home grid's infinite row model"""
+    return callback_payload(
+        ['data-table.getRowsResponse'],
+        [('data-table', 'getRowsRequest', {'startRow': start, 'endRow': end, 'sortModel': [], 'filterModel': {}})],
+        state=[('data-table', 'eventData', None), ('diff-baseline', 'value', None)],
+        changed=['data-table.getRowsRequest'],
+    )
+
+
+class LoadTest:
+
+    def __init__(self, make_session, sessions, iterations, think_time=0.0, seed=None):
+        self.make_session = make_session
+        self.sessions = sessions
+        self.iterations = iterations
+        self.think_time = think_time
+        self.random = random.Random(seed)
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def _timed(self, session, endpoint, method, path, payload=None):
+        start = time.perf_counter()
+        try:
+            status, body = session.request(method, path, payload)
+        except Exception:
+            status, body = None, b''
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            self.latencies[endpoint].append(elapsed)
+            if status != 200:
+                self.errors[endpoint] += 1
+        if self.think_time:
+            time.sleep(self.think_time)
+        return body if status == 200 else None
+
+    def user_flow(self, session):
+        # Open home: the page, its layout and the first block of grid rows
+        self._timed(session, 'GET /', 'GET', '/')
+        self._timed(session, 'layout /', 'POST', UPDATE_COMPONENT, page_payload('/'))
+        body = self._timed(session, 'callback data-table.getRowsRequest', 'POST', UPDATE_COMPONENT,
+                           rows_payload())
+        rows = json.loads(body)['response']['data-table']['getRowsResponse']['rowData'] if body else None
+        if not rows:
+            return
+        with self.lock:
+            row = self.random.choice(rows)
+
+        # Select a row
+        self._timed(session, 'callback data-table.selectedRows', 'POST', UPDATE_COMPONENT, callback_payload(
+            ['show-details-btn.disabled', 'show-details-btn.className',
+             'selected-row-info-text.children', 'selected-row-store.data'],
+            [('data-table', 'selectedRows', [row]), ('data-table', 'cellDoubleClicked', None)],
+            changed=['data-table.selectedRows'],
+        ))
+
+        # Open the detail page
+        detail_path = '/details/position/{}/{}'.format(
+            urllib.parse.quote(row['Position ID']), urllib.parse.quote(row['Business Date'])
+        )
+        self._timed(session, 'GET /details/position/<id>/<date>', 'GET', detail_path)
+        self._timed(session, 'layout /details/position/<id>/<date>', 'POST', UPDATE_COMPONENT,
+                    page_payload(detail_path))
+
+        # Back home and refresh, which makes the grid fetch its rows again
+        self._timed(session, 'refresh (data-table.getRowsRequest)', 'POST', UPDATE_COMPONENT,
+                    rows_payload())
+
+    def _run_session(self):
+        session = self.make_session()
+        for _ in range(self.iterations):
+            self.user_flow(session)
+
+    def run(self):
+        threads = [threading.Thread(target=self._run_session) for _ in range(self.sessions)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.wall_time = time.perf_counter() - start
+        return self.report()
+
+    def report(self):
+        rows = []
+        for endpoint, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            rows.append({
+                'endpoint': endpoint,
+                'requests': len(latencies),
+                'errors': self.errors[endpoint],
+                'throughput': len(latencies) / self.wall_time,
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'p99': percentile(latencies, 99),
+            })
+        return rows
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return float('nan')
+    rank = max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def print_report(rows, wall_time, sessions):
+    total = sum(x['requests'] for x in rows)
+    print(f"{sessions} sessions, {total} requests in {wall_time:.2f}s "
+          f"({total / wall_time:.1f} req/s)")
+    header = f"{'endpoint':<42}{'reqs':>7}{'errs':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print('-' * len(header))
+    for x in rows:
+        print(f"{x['endpoint']:<42}{x['requests']:>7}{x['errors']:>6}{x['throughput']:>9.1f}"
+              f"{x['p50'] * 1000:>9.1f}{x['p95'] * 1000:>9.1f}{x['p99'] * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--url', help="Base URL of a running server; runs in-process if omitted")
+    parser.add_argument('--sessions', type=int, default=8, help="Concurrent user sessions")
+    parser.add_argument('--iterations', type=int, default=10, help="User flows per session")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Pause between requests, in seconds")
+    parser.add_argument('--seed', type=int, help="Seed for the row picks")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if args.url:
+        make_session = lambda: HttpSession(args.url)
+    else:
+        from app import app
+        make_session = lambda: TestClientSession(app.server)
+
+    test = LoadTest(make_session, args.sessions, args.iterations, args.think_time, args.seed)
+    rows = test.run()
+    if args.json:
+        print(json.dumps({'wall_time': test.wall_time, 'sessions': args.sessions, 'endpoints': rows}, indent=2))
+    else:
+        print_report(rows, test.wall_time, args.sessions)
+
+
+if __name__ == '__main__':
+    main()
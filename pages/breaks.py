@@ -0,0 +1,166 @@
+import dash
+from dash import dcc, html, Input, Output, callback
+import dash_ag_grid as dag
+import plotly.graph_objects as go
+
+import data_loader as dl
+from breaks import HEATMAP_METRICS
+
+
+dash.register_page(__name__, path='/breaks', title="Breaks")
+
+
+def layout():
+    detector = dl.current().break_detector
+    business_dates = detector.business_dates
+
+    return html.Div([
+        html.H2("RTPL vs CleanPnL Breaks", className="mb-4"),
+        html.P(
+            f"Rows whose RTPL - CleanPnL is at least {detector.threshold:g} standard deviations "
+            f"away from the position's previous {detector.window} business dates.",
+            className="text-muted"
+        ),
+
+        # Book-wide view, aggregated on the server; click a cell to list its positions
+        html.Div([
+            html.Strong("Heatmap: ", style={'marginRight': '10px'}),
+            dcc.RadioItems(
+                id='breaks-heatmap-metric',
+                options=[{'label': label, 'value': metric} for metric, label in HEATMAP_METRICS.items()],
+                value='sum',
+                inline=True,
+                inputStyle={'marginRight': '5px', 'marginLeft': '15px'},
+            ),
+        ], style={'display': 'flex', 'alignItems': 'center'}),
+        dcc.Graph(
+            id='breaks-heatmap',
+            figure=make_heatmap_figure(detector, 'sum'),
+            config={'displayModeBar': False},
+        ),
+
+        html.Div([
+            html.Strong("Business Date: ", style={'marginRight': '10px'}),
+            dcc.Dropdown(
+                id='breaks-date',
+                options=[{'label': 'All dates', 'value': ''}]
+                        + [{'label': x, 'value': x} for x in business_dates],
+                value=business_dates[0] if business_dates else '',
+                clearable=False,
+                style={'width': '250px'}
+            ),
+            html.Span(id='breaks-table-caption', className="text-muted", style={'marginLeft': '20px'}),
+        ], style={'display': 'flex', 'alignItems': 'center'}, className="mb-3"),
+
+        dag.AgGrid(
+            id="breaks-table",
+            rowData=make_breaks_records(detector, business_dates[0] if business_dates else ''),
+            columnDefs=[
+                {'field': 'Position ID', 'pinned': 'left', 'width': 170},
+                {'field': 'Business Date', 'width': 140},
+                {'field': 'Asset Type', 'width': 170},
+                {'field': 'CleanPnL', 'type': 'numericColumn'},
+                {'field': 'RTPL', 'type': 'numericColumn'},
+                {'field': 'Diff', 'headerName': 'RTPL - CleanPnL', 'type': 'numericColumn'},
+                {'field': 'Mean', 'headerName': 'Rolling Mean', 'type': 'numericColumn'},
+                {'field': 'Std', 'headerName': 'Rolling Std', 'type': 'numericColumn'},
+                {'field': 'Z', 'headerName': 'Z-Score', 'type': 'numericColumn', 'sort': 'desc',
+                 'comparator': {'function': 'Math.abs(valueA) - Math.abs(valueB)'}},
+            ],
+            defaultColDef={
+                'resizable': True,
+                'sortable': True,
+                'filter': True,
+                'width': 150,
+                'valueFormatter': {'function': "typeof params.value === 'number' ? d3.format(',.2f')(params.value) : params.value"},
+            },
+            getRowId="params.data['Position ID'] + '|' + params.data['Business Date']",
+            dashGridOptions={
+                'rowSelection': 'single',
+                'animateRows': True,
+                'pagination': True,
+                'paginationPageSize': 15,
+            },
+            style={'height': '500px', 'width': '100%'},
+            className="ag-theme-alpine"
+        ),
+    ])
+
+
+def make_breaks_records(detector, business_date):
+    flagged = detector.flagged(business_date or None)
+    return flagged.round(4).to_dict('records')
+
+
+def make_heatmap_figure(detector, metric):
+    heatmap = detector.heatmap()
+    values = heatmap[metric]
+    diverging = metric == 'sum'
+
+    fig = go.Figure(go.Heatmap(
+        z=values.to_numpy(),
+        x=list(values.columns),
+        y=list(values.index),
+        customdata=heatmap['rows'].to_numpy(),
+        colorscale='RdBu_r' if diverging else 'Reds',
+        zmid=0 if diverging else None,
+        hoverongaps=False,
+        hovertemplate=(
+            "%{y} on %{x}<br>" + HEATMAP_METRICS[metric] + ": %{z:,.2f}"
+            "<br>%{customdata:,.0f} positions<extra></extra>"
+        ),
+    ))
+    fig.update_layout(
+        height=max(250, 40 * len(values.index) + 120),
+        margin={'l': 10, 'r': 10, 't': 10, 'b': 10},
+        xaxis={'type': 'category', 'title': 'Business Date'},
+        yaxis={'title': 'Asset Type'},
+    )
+    return fig
+
+
+@callback(
+    Output('breaks-heatmap', 'figure'),
+    Input('breaks-heatmap-metric', 'value'),
+    prevent_initial_call=True
+)
+def select_heatmap_metric(metric):
+    return make_heatmap_figure(dl.current().break_detector, metric)
+
+
+@callback(
+    Output('breaks-table', 'rowData'),
+    Output('breaks-table-caption', 'children'),
+    Input('breaks-date', 'value'),
+    Input('breaks-heatmap', 'clickData'),
+    prevent_initial_call=True
+)
+def select_breaks(business_date, click_data):
+    """Show the flagged positions of the selected business date, or every position of a clicked heatmap cell"""
+    detector = dl.current().break_detector
+    ctx = dash.callback_context
+
+    if ctx.triggered and ctx.triggered[0]['prop_id'].startswith('breaks-heatmap') and click_data:
+        point = click_data['points'][0]
+        rows = detector.bucket(point['y'], point['x'])
+        return rows.round(4).to_dict('records'), f"All {len(rows)} {point['y']} positions on {point['x']}"
+
+    return make_breaks_records(detector, business_date), ""
+
+
+# Open the detail view of a flagged position on double click
+dash.clientside_callback(
+    """
+    function(cell_double_clicked) {
+        if (cell_double_clicked && cell_double_clicked.rowId) {
+            const [positionId, businessDate] = cell_double_clicked.rowId.split('|');
+            const url = `/details/position/${encodeURIComponent(positionId)}/${encodeURIComponent(businessDate)}`;
+            window.open(url, '_blank');
+        }
+        return dash_clientside.no_update;
+    }
+    """,
+    Output('breaks-table', 'className'),
+    Input('breaks-table', 'cellDoubleClicked'),
+    prevent_initial_call=True
+)
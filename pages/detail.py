@@ -1,7 +1,6 @@
 import dash
 from dash import dcc, html, Input, Output, State, callback
 from dash import dash_table
-import dash_ag_grid as dag
 import plotly.graph_objects as go
 import plotly.express as px
 import dash_bootstrap_components as dbc
@@ -12,6 +11,7 @@ from datetime import datetime
 import json
 
 import data_loader as dl
+from components.grouped_grid import make_grouped_grid, expanded_groups
 
 dash.register_page(__name__,
                    path_template="/details/position/<position_id>/<business_date>",
@@ -21,22 +21,19 @@ def layout(position_id, business_date):
     _position_id = urllib.parse.unquote(position_id)
     _business_date = urllib.parse.unquote(business_date)
 
-    df_position = (
-        dl.df
-        .query("`Position ID` == @_position_id and `Business Date` == @_business_date")
-        .reset_index(drop=True)
-        .copy()
-    )
-    df_position_trend = dl.df.query("`Position ID` == @position_id").copy()
+    # One dataset version for the whole page, even if a reload swaps it meanwhile
+    ds = dl.current()
+    df_position = ds.source.row(_position_id, _business_date).copy()
+    df_position_trend = ds.source.position_history(_position_id).copy()
 
     return html.Div([
         # Details Card
         html.H2("Position Details", className="mb-4"),
-        make_detail_card(df_position),
+        make_detail_card(df_position, ds.column_schema),
 
         # Trend Table Part
         html.H2("Position Trend", className="mb-4"),
-        make_trend_table(df_position_trend),
+        make_trend_table(df_position_trend, ds.column_schema),
 
         # Trend Plot Part
         make_trend_plot(df_position_trend),
@@ -44,21 +41,12 @@ def layout(position_id, business_date):
     ])
 
 
-def make_detail_card(df_position):
-
-    cols1 = (
-        ['Position ID', 'Business Date', 'Asset Type', 'CleanPnL']
-        + [x for x in df_position.columns if x.startswith('Meta')]
-    )
-    cols2 = [x for x in df_position.columns if x.startswith('Pnl')]
-    cols3 = [x for x in df_position.columns if x.startswith('RTPL')]
-    cols4 = [x for x in df_position.columns if x.startswith('Settings')]
+def make_detail_card(df_position, schema):
 
+    # Column families come from the shared schema; the key columns lead the basic card
     _data = {
-        'Basic': cols1,
-        'Clean PnL': cols2,
-        'RTPL': cols3,
-        'Settings': cols4
+        name: (schema.key_columns + cols if name == 'Basic' else cols)
+        for name, cols in schema.groups.items()
     }
 
     return html.Div([
@@ -109,50 +97,29 @@ def make_detail_card_table(df):
     ]
 
 
-def make_trend_table(df):
-
-    columnDefs = []
-    for col_name, col_type in zip(df.columns, df.dtypes):
-        col_def = {
-            'field': col_name,
-            'id': col_name.lower().replace(' ', '_'),
-            'headerName': col_name,
-            'width': 150
-        }
-        if pd.api.types.is_numeric_dtype(col_type):
-            col_def['type'] = 'numericColumn'
-        elif pd.api.types.is_datetime64_any_dtype(col_type):
-            col_def['type'] = 'dateColumn'
-        else:
-            col_def['type'] = 'textColumn'
-
-        columnDefs.append(col_def)
+def make_trend_table(df, schema, **grid_kwargs):
 
     return html.Div([
         html.H3("Position Historical Trend", className="mb-5"),
-        # AG Grid table
-        dag.AgGrid(
-            id="data-table",
-            rowData=df.to_dict('records'),
-            columnDefs=columnDefs,
-            defaultColDef={
-                'resizable': True,
-                'sortable': True,
-                'filter': True,
-            },
-            dashGridOptions={
-                'rowSelection': 'single',
-                'suppressRowClickSelection': False,
-                'animateRows': True,
-                'pagination': True,
-                'paginationPageSize': 15,
-            },
-            style={'height': '500px', 'width': '100%'},
-            className="ag-theme-alpine"
-        ),
+        # AG Grid table, column families load as their groups are expanded
+        make_grouped_grid("trend-table", schema, df, **grid_kwargs),
+        dcc.Store(id='trend-table-position', data=df['Position ID'].iloc[0] if len(df) else None),
     ])
 
 
+@callback(
+    Output('trend-table', 'rowData'),
+    Input('trend-table', 'eventData'),
+    State('trend-table-position', 'data'),
+    prevent_initial_call=True
+)
+def expand_trend_table(event_data, position_id):
+    """Ship the columns of the expanded groups for the position trend"""
+    ds = dl.current()
+    columns = ds.column_schema.columns(expanded_groups(event_data))
+    return ds.source.position_history(position_id, columns=columns).to_dict('records')
+
+
 def make_trend_plot(df):
     # Placeholder for future plot implementation
     
@@ -1,47 +1,30 @@
 import dash
 from dash import dcc, html, Input, Output, State, callback
-import dash_ag_grid as dag
+from dash.exceptions import PreventUpdate
 
-import pandas as pd
 from datetime import datetime
 import json
+import os
+import urllib.parse
 
 import data_loader as dl
+from components.grouped_grid import make_grouped_grid, expanded_groups
+from data_sources.memory import order_frame
 
 
 dash.register_page(__name__, path='/')
 
-df = dl.df
+# Cell rules for the snapshot diff view, see snapshot_diff.SnapshotDiff.rows
+DIFF_COLUMNS = ['_status', '_changed', '_old']
+DIFF_CHANGED_RULE = "params.data && params.data._changed && params.data._changed.includes(params.colDef.field)"
+DIFF_TOOLTIP = (
+    "params.data && params.data._changed && params.data._changed.includes(params.colDef.field)"
+    " ? 'was: ' + params.data._old[params.colDef.field] : undefined"
+)
 
 # Define the layout for the data table page
 def create_data_table_layout():
-    
-    # Column definitions for AG Grid
-    # columnDefs = [
-        # {'field': 'id', 'headerName': 'ID', 'width': 80, 'pinned': 'left'},
-        # {'field': 'name', 'headerName': 'Product Name', 'width': 150},
-        # {'field': 'category', 'headerName': 'Category', 'width': 120},
-        # {'field': 'price', 'headerName': 'Price ($)', 'width': 100, 'type': 'numericColumn'},
-        # {'field': 'stock', 'headerName': 'Stock', 'width': 100, 'type': 'numericColumn'},
-        # {'field': 'last_updated', 'headerName': 'Last Updated', 'width': 130}
-    # ]
-    columnDefs = []
-    for col_name, col_type in zip(df.columns, df.dtypes):
-        col_def = {
-            'field': col_name,
-            'id': col_name.lower().replace(' ', '_'),
-            'headerName': col_name,
-            'width': 150
-        }
-        if pd.api.types.is_numeric_dtype(col_type):
-            col_def['type'] = 'numericColumn'
-        elif pd.api.types.is_datetime64_any_dtype(col_type):
-            col_def['type'] = 'dateColumn'
-        else:
-            col_def['type'] = 'textColumn'
-
-        columnDefs.append(col_def)
-    
+    ds = dl.current()
     
     return html.Div([
         # Control panel
@@ -60,6 +43,31 @@ def create_data_table_layout():
                     className="btn btn-primary"
                 ),
             ], className="mb-3"),
+
+            # Diff against another version of the dataset
+            html.Div([
+                html.Strong("Compare with: ", style={'marginRight': '10px'}),
+                dcc.Dropdown(
+                    id="diff-baseline",
+                    # Only file names go to the client, the server maps them back to a path
+                    options=[os.path.basename(x) for x in dl.snapshot_files()],
+                    placeholder="Another dataset version, to show only changed rows",
+                    style={'width': '450px'}
+                ),
+                html.Span(id="diff-summary", className="text-muted", style={'marginLeft': '10px'}),
+            ], style={'display': 'flex', 'alignItems': 'center'}, className="mb-3"),
+
+            # Quick find by Position ID, served from the prefix index
+            html.Div([
+                dcc.Input(
+                    id="position-search",
+                    type="search",
+                    placeholder="Find Position ID...",
+                    autoComplete="off",
+                    className="form-control"
+                ),
+                html.Div(id="position-search-results", className="list-group"),
+            ], style={'width': '350px'}, className="mb-3"),
             
             # Selected row info
             html.Div([
@@ -69,16 +77,26 @@ def create_data_table_layout():
                 ], className="alert alert-info")
             ], id="selected-row-info", className="mb-3"),
         ]),
+
+        # Dataset version and source status
+        html.Small(ds.describe(), className="text-muted d-block mb-2"),
         
-        # AG Grid table
-        dag.AgGrid(
-            id="data-table",
-            rowData=df.to_dict('records'),
-            columnDefs=columnDefs,
+        # AG Grid table, rows are paged in from the data source and column
+        # families load as their groups are expanded
+        make_grouped_grid(
+            "data-table", ds.column_schema,
+            rowModelType="infinite",
             defaultColDef={
                 'resizable': True,
                 'sortable': True,
                 'filter': True,
+                # Highlight cells changed against the compared version
+                'cellClassRules': {'diff-changed': DIFF_CHANGED_RULE},
+                'tooltipValueGetter': {'function': DIFF_TOOLTIP},
+            },
+            rowClassRules={
+                'diff-added': "params.data && params.data._status === 'added'",
+                'diff-removed': "params.data && params.data._status === 'removed'",
             },
             dashGridOptions={
                 'rowSelection': 'single',
@@ -86,16 +104,17 @@ def create_data_table_layout():
                 'animateRows': True,
                 'pagination': True,
                 'paginationPageSize': 15,
+                'cacheBlockSize': 100,
+                'maxBlocksInCache': 20,
             },
-            style={'height': '500px', 'width': '100%'},
-            className="ag-theme-alpine"
         ),
+        dcc.Store(id='data-table-reload'),
         
         # Store selected row data
         dcc.Store(id='selected-row-store'),
         
         # URL component for navigation (will be used later for multi-page)
-        dcc.Location(id='url', refresh=False),
+        dcc.Location(id='url', refresh='callback-nav'),
     ])
 
 # Main app layout with basic routing structure
@@ -161,17 +180,108 @@ def handle_row_selection(selected_rows, double_clicked):
     # No selection
     return True, "btn btn-secondary", "", None
 
-# Callback for refresh button
+# Callback serving blocks of grid rows, with only the expanded column groups
+@callback(
+    Output('data-table', 'getRowsResponse'),
+    Input('data-table', 'getRowsRequest'),
+    [State('data-table', 'eventData'),
+     State('diff-baseline', 'value')],
+    prevent_initial_call=True
+)
+def serve_rows(request, event_data, baseline):
+    """Fetch the requested rows, sorted and filtered by the data source"""
+    if not request:
+        return dash.no_update
+    ds = dl.current()
+    columns = ds.column_schema.columns(expanded_groups(event_data))
+    start, end = request['startRow'], request['endRow']
+
+    if not baseline:
+        rows, row_count = ds.source.page(
+            start, end, request.get('sortModel'), request.get('filterModel'), columns
+        )
+        return {'rowData': rows.to_dict('records'), 'rowCount': row_count}
+
+    # Only the changed, added and removed rows when comparing versions
+    try:
+        diff_rows = ds.snapshot_diff(baseline).rows
+    except KeyError:
+        raise PreventUpdate
+    positions = order_frame(diff_rows, request.get('sortModel'), request.get('filterModel'))
+    rows = diff_rows.iloc[positions[start:end]][
+        [x for x in columns if x in diff_rows.columns] + DIFF_COLUMNS
+    ]
+    return {'rowData': rows.to_dict('records'), 'rowCount': len(positions)}
+
+# Refresh, column group expansion and diff selection drop the cached blocks,
+# so the grid fetches its rows again
+dash.clientside_callback(
+    """
+    function(n_clicks, event_data, baseline) {
+        dash_ag_grid.getApiAsync('data-table').then(api => api.purgeInfiniteCache());
+        return dash_clientside.no_update;
+    }
+    """,
+    Output('data-table-reload', 'data'),
+    [Input('refresh-btn', 'n_clicks'),
+     Input('data-table', 'eventData'),
+     Input('diff-baseline', 'value')],
+    prevent_initial_call=True
+)
+
+@callback(
+    Output('diff-summary', 'children'),
+    Input('diff-baseline', 'value'),
+    prevent_initial_call=True
+)
+def summarize_diff(baseline):
+    """Describe the differences against the compared version"""
+    if not baseline:
+        return ""
+    try:
+        summary = dl.current().snapshot_diff(baseline).summary()
+    except KeyError:
+        return "Unknown dataset version"
+    return (
+        f"{summary['changed']:,} changed rows ({summary['changed_cells']:,} cells), "
+        f"{summary['added']:,} added, {summary['removed']:,} removed"
+    )
+
+def make_detail_path(position_id, business_date):
+    return "/details/position/{}/{}".format(
+        urllib.parse.quote(position_id, safe=''), urllib.parse.quote(business_date, safe='')
+    )
+
+# Callback for the Position ID quick find
+@callback(
+    Output('position-search-results', 'children'),
+    Input('position-search', 'value'),
+    prevent_initial_call=True
+)
+def search_positions(prefix):
+    """List the positions whose ID starts with the typed prefix"""
+    return [
+        dcc.Link([
+            html.Strong(position_id),
+            html.Span(f" latest {business_date}", className="text-muted")
+        ], href=make_detail_path(position_id, business_date),
+           className="list-group-item list-group-item-action")
+        for position_id, business_date in dl.current().position_index.search(prefix or '')
+    ]
+
+# Pressing enter in the quick find jumps to the top match
 @callback(
-    Output('data-table', 'rowData'),
-    Input('refresh-btn', 'n_clicks'),
+    Output('url', 'pathname'),
+    Input('position-search', 'n_submit'),
+    State('position-search', 'value'),
     prevent_initial_call=True
 )
-def refresh_data(n_clicks):
-    """Refresh the data in the table"""
-    if n_clicks:
-        return df.to_dict('records')
-    return dash.no_update
+def open_top_match(n_submit, prefix):
+    """Open the detail view of the best matching position"""
+    matches = dl.current().position_index.search(prefix or '', limit=1)
+    if not matches:
+        return dash.no_update
+    return make_detail_path(*matches[0])
 
 # Callback for show details button (placeholder for navigation)
 dash.clientside_callback(
@@ -0,0 +1,85 @@
+import dash
+from dash import dcc, html, Input, Output, callback
+import dash_ag_grid as dag
+
+import data_loader as dl
+from column_stats import SUMMARY_COLUMNS
+
+
+dash.register_page(__name__, path='/summary', title="Summary")
+
+
+def layout():
+    ds = dl.current()
+    stats = ds.column_stats
+    business_dates = stats.business_dates
+
+    return html.Div([
+        html.H2("Column Summary", className="mb-4"),
+        html.P(
+            "Distribution of every numeric column across the book. Quantiles are "
+            "approximate, from sketches built per business date and asset type at load time.",
+            className="text-muted"
+        ),
+        html.Div([
+            html.Strong("Asset Type: ", style={'marginRight': '10px'}),
+            dcc.Dropdown(
+                id='summary-asset-type',
+                options=[{'label': 'All asset types', 'value': ''}]
+                        + [{'label': x, 'value': x} for x in stats.asset_types],
+                value='',
+                clearable=False,
+                style={'width': '250px', 'marginRight': '20px'}
+            ),
+            html.Strong("Business Dates: ", style={'marginRight': '10px'}),
+            dcc.DatePickerRange(
+                id='summary-dates',
+                min_date_allowed=business_dates[0] if business_dates else None,
+                max_date_allowed=business_dates[-1] if business_dates else None,
+                start_date=business_dates[0] if business_dates else None,
+                end_date=business_dates[-1] if business_dates else None,
+                display_format='YYYY-MM-DD',
+            ),
+        ], style={'display': 'flex', 'alignItems': 'center'}, className="mb-3"),
+
+        dag.AgGrid(
+            id="summary-table",
+            rowData=make_summary_records(ds),
+            columnDefs=[
+                {'field': 'Group', 'pinned': 'left', 'width': 120},
+                {'field': 'Column', 'pinned': 'left', 'width': 170},
+            ] + [
+                {'field': x, 'type': 'numericColumn'} for x in SUMMARY_COLUMNS[1:]
+            ],
+            defaultColDef={
+                'resizable': True,
+                'sortable': True,
+                'width': 140,
+                'valueFormatter': {'function': "typeof params.value === 'number' ? d3.format(',.2f')(params.value) : params.value"},
+            },
+            dashGridOptions={'domLayout': 'autoHeight'},
+            style={'width': '100%'},
+            className="ag-theme-alpine"
+        ),
+    ])
+
+
+def make_summary_records(ds, asset_type=None, start=None, end=None):
+    """Summary rows of one dataset version, labelled with its column groups"""
+    group_of = {col: name for name, cols in ds.column_schema.groups.items() for col in cols}
+    summary = ds.column_stats.summary(asset_type or None, start, end)
+    summary.insert(0, 'Group', summary['Column'].map(group_of))
+    return summary.to_dict('records')
+
+
+@callback(
+    Output('summary-table', 'rowData'),
+    Input('summary-asset-type', 'value'),
+    Input('summary-dates', 'start_date'),
+    Input('summary-dates', 'end_date'),
+    prevent_initial_call=True
+)
+def select_summary(asset_type, start_date, end_date):
+    """Merge the partition summaries of the selected asset type and date range"""
+    return make_summary_records(dl.current(), asset_type,
+                                start_date and start_date[:10], end_date and end_date[:10])
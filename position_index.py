@@ -0,0 +1,56 @@
+# dash_multi_tab_dashboard/position_index.py
+from bisect import bisect_left
+
+
+class PositionIndex:
+    """
+    Prefix index over the distinct Position IDs, built once at load time.
+
+    Keys are kept in a sorted list and searched with bisect, so a lookup costs
+    O(log n) plus the number of matches returned. Each position is indexed both
+    by its full id and by its numeric suffix (`Equity_0012` also under `0012`),
+    case-insensitively, and carries its latest Business Date.
+    """
+
+    def __init__(self, df):
+        # Sort + dedupe rather than a string groupby max, which is far slower
+        latest = (
+            df[['Position ID', 'Business Date']]
+            .sort_values('Business Date', kind='mergesort')
+            .drop_duplicates('Position ID', keep='last')
+            .set_index('Position ID')['Business Date']
+            .sort_index()
+        )
+        self.position_ids = latest.index.tolist()
+        self.latest_dates = latest.tolist()
+
+        entries = []
+        for i, position_id in enumerate(self.position_ids):
+            key = position_id.lower()
+            entries.append((key, i))
+            _, sep, suffix = key.rpartition('_')
+            if sep and suffix:
+                entries.append((suffix, i))
+        entries.sort()
+        self._keys = [x[0] for x in entries]
+        self._positions = [x[1] for x in entries]
+
+    def __len__(self):
+        return len(self.position_ids)
+
+    def search(self, prefix, limit=10):
+        """Up to `limit` (Position ID, latest Business Date) pairs whose id starts with `prefix`"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+
+        matches = []
+        seen = set()
+        i = bisect_left(self._keys, prefix)
+        while i < len(self._keys) and self._keys[i].startswith(prefix) and len(matches) < limit:
+            position = self._positions[i]
+            if position not in seen:
+                seen.add(position)
+                matches.append((self.position_ids[position], self.latest_dates[position]))
+            i += 1
+        return matches
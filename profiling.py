@@ -0,0 +1,102 @@
+# dash_multi_tab_dashboard/profiling.py
+"""
+Opt-in profiling of single requests.
+
+Start the app with DASHBOARD_PROFILE set, then mark the request to profile
+with an `X-Profile: 1` header or a `?profile=1` query parameter. The profile is
+written to DASHBOARD_PROFILE_DIR (./profiles by default), named after the route
+and, for Dash callbacks, the callback outputs plus the page path (for page
+routing) or the inputs that triggered the callback.
+
+    DASHBOARD_PROFILE=1             cProfile, saved as .prof (open with snakeviz
+                                    or any pstats flame graph viewer)
+    DASHBOARD_PROFILE=pyinstrument  sampling profiler, saved as an HTML flame chart
+
+Without DASHBOARD_PROFILE no hooks are installed, so normal serving is untouched.
+"""
+import cProfile
+import logging
+import os
+import re
+import time
+
+from flask import g, request
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODE = os.environ.get('DASHBOARD_PROFILE', '')
+PROFILE_DIR = os.environ.get('DASHBOARD_PROFILE_DIR', './profiles')
+
+
+def _wants_profile():
+    return (
+        request.headers.get('X-Profile', '') not in ('', '0')
+        or request.args.get('profile', '') not in ('', '0')
+    )
+
+
+def _profile_name():
+    name = request.path
+    if request.path.endswith('/_dash-update-component'):
+        # Callback id: its outputs, e.g. "..a.children...b.data.." -> "a.children+b.data"
+        payload = request.get_json(silent=True) or {}
+        outputs = str(payload.get('output', '')).strip('.').split('...')
+        name += '__' + '+'.join(outputs) + '__' + _callback_trigger(payload)
+    name = re.sub(r'[^A-Za-z0-9_.+-]+', '_', name).strip('_.') or 'root'
+    now = time.time()
+    return f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}.{int(now * 1000) % 1000:03d}_{name[:150]}"
+
+
+def _callback_trigger(payload):
+    """The page path for the page routing callback, else the ids of the inputs that fired"""
+    for x in payload.get('inputs', []):
+        if isinstance(x, dict) and x.get('id') == '_pages_location' and x.get('property') == 'pathname':
+            return str(x.get('value') or '/')
+    return '+'.join(str(x) for x in payload.get('changedPropIds', [])) or 'initial'
+
+
+def _start_profile():
+    if not _wants_profile():
+        return
+    if PROFILE_MODE == 'pyinstrument':
+        from pyinstrument import Profiler
+        g.profiler = Profiler()
+        g.profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only one cProfile can be active at a time on newer Pythons
+            logger.warning("Skipped profiling %s, another request is being profiled", request.path)
+            return
+        g.profiler = profiler
+
+
+def _stop_profile(exc=None):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, _profile_name())
+    if PROFILE_MODE == 'pyinstrument':
+        profiler.stop()
+        path += '.html'
+        with open(path, 'w') as f:
+            f.write(profiler.output_html())
+    else:
+        profiler.disable()
+        path += '.prof'
+        profiler.dump_stats(path)
+    logger.info("Saved profile of %s to %s", request.path, path)
+
+
+def init_profiling(server):
+    """Install the profiling hooks on the Flask server when DASHBOARD_PROFILE is set"""
+    if not PROFILE_MODE or PROFILE_MODE == '0':
+        return
+    server.before_request(_start_profile)
+    server.teardown_request(_stop_profile)
+    logger.info("Request profiling enabled (%s), writing to %s", PROFILE_MODE, PROFILE_DIR)
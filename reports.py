@@ -0,0 +1,277 @@
+# dash_multi_tab_dashboard/reports.py
+"""
+Batch rendering of position detail reports.
+
+Each report is a self-contained HTML file with the same detail card, trend
+table and plots as the detail page, for archiving or sending offline. Reports
+are rendered on a process pool; on platforms that fork, the workers share the
+dataset already loaded by the parent instead of loading their own.
+
+    # Every break flagged on a business date (all dates if omitted)
+    python reports.py --flagged 2024-01-15 --out reports/
+
+    # A list of positions, one "Position ID,Business Date" per line
+    python reports.py --positions positions.csv --workers 8
+
+    # Every position on its latest business date
+    python reports.py --all
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import re
+import time
+from html import escape
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+from dash import dcc, html, dash_table
+import dash_ag_grid as dag
+
+from app import app  # noqa: F401, registers the pages
+import data_loader as dl
+from pages.detail import make_detail_card, make_trend_table, make_trend_plot
+
+
+REPORT_CSS = """
+body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; background-color: #f8f9fa; }
+.card { background: white; border: 1px solid #dee2e6; border-radius: 6px; margin-bottom: 10px; flex: 1; min-width: 0; }
+.card-header { padding: 8px 12px; background: rgba(0,0,0,0.03); border-bottom: 1px solid #dee2e6; font-weight: bold; }
+.card-body { padding: 8px 12px; overflow-x: auto; }
+.mb-4 { margin-bottom: 1.5rem; }
+.mb-5 { margin-bottom: 3rem; }
+table { border-collapse: collapse; font-size: 14px; width: 100%; }
+th, td { text-align: left; padding: 6px 12px; white-space: nowrap; }
+th { border-bottom: 2px solid #dee2e6; }
+tbody tr:nth-child(odd) { background-color: rgba(0,0,0,0.02); }
+.grid { max-height: 500px; overflow: auto; background: white; border: 1px solid #dee2e6; }
+.grid th { position: sticky; top: 0; background: white; }
+"""
+
+# Bootstrap classes of the dbc components used by the detail page
+_DBC_CLASSES = {'Card': 'card', 'CardHeader': 'card-header', 'CardBody': 'card-body'}
+
+
+def _style(style):
+    return '; '.join(f"{_css_name(k)}: {v}" for k, v in style.items())
+
+
+def _css_name(prop):
+    return re.sub('([A-Z])', r'-\1', prop).lower()
+
+
+def _cell(value):
+    if value is None or value != value:
+        return ''
+    return escape(str(value))
+
+
+def _table(columns, records):
+    """columns: (header, field) pairs"""
+    head = ''.join(f'<th>{escape(str(name))}</th>' for name, _ in columns)
+    body = ''.join(
+        '<tr>' + ''.join(f'<td>{_cell(row.get(field))}</td>' for _, field in columns) + '</tr>'
+        for row in records
+    )
+    return f'<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>'
+
+
+def _grid_columns(column_defs):
+    """Leaf (header, field) pairs of AG Grid column definitions, placeholder columns left out"""
+    columns = []
+    for col in column_defs:
+        if 'children' in col:
+            columns.extend(_grid_columns(col['children']))
+        elif 'field' in col:
+            columns.append((col.get('headerName', col['field']), col['field']))
+    return columns
+
+
+def render_html(component):
+    """Static HTML for a tree of the Dash components used by the detail page"""
+    if component is None:
+        return ''
+    if isinstance(component, (list, tuple)):
+        return ''.join(render_html(x) for x in component)
+    if not hasattr(component, '_type'):
+        return escape(str(component))
+
+    if isinstance(component, dcc.Store):
+        return ''
+    if isinstance(component, dcc.Graph):
+        return pio.to_html(component.figure, full_html=False, include_plotlyjs=False)
+    if isinstance(component, dash_table.DataTable):
+        return _table([(x['name'], x['id']) for x in component.columns], component.data or [])
+    if isinstance(component, dag.AgGrid):
+        return f'<div class="grid">{_table(_grid_columns(component.columnDefs), component.rowData or [])}</div>'
+
+    props = component.to_plotly_json()['props']
+    if component._namespace == 'dash_bootstrap_components':
+        tag, classes = 'div', [_DBC_CLASSES.get(component._type, '')]
+    else:
+        tag, classes = component._type.lower(), []
+    classes = ' '.join(x for x in classes + [props.get('className')] if x)
+    attrs = ''
+    if classes:
+        attrs += f' class="{escape(classes)}"'
+    if props.get('style'):
+        attrs += f' style="{escape(_style(props["style"]))}"'
+    if props.get('id'):
+        attrs += f' id="{escape(str(props["id"]))}"'
+    return f'<{tag}{attrs}>{render_html(props.get("children"))}</{tag}>'
+
+
+def render_report(position_id, business_date, plotlyjs='inline'):
+    """Full HTML document of one position's detail report"""
+    ds = dl.current()
+    df_position = ds.source.row(position_id, business_date)
+    df_history = ds.source.position_history(position_id)
+
+    body = html.Div([
+        html.H1(f"{position_id} on {business_date}", className="mb-4"),
+        html.H2("Position Details", className="mb-4"),
+        make_detail_card(df_position, ds.column_schema),
+        html.H2("Position Trend", className="mb-4"),
+        # Every column family, as there is nothing to expand in a static report
+        make_trend_table(df_history, ds.column_schema, rowData=df_history.to_dict('records')),
+        make_trend_plot(df_history),
+    ])
+
+    if plotlyjs == 'inline':
+        script = f'<script type="text/javascript">{_plotly_js()}</script>'
+    else:
+        script = f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+    return (
+        '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+        f'<title>{escape(position_id)} {escape(business_date)}</title>\n'
+        f'<style>{REPORT_CSS}</style>\n{script}\n</head>\n'
+        f'<body>\n{render_html(body)}\n'
+        f'<footer><small>Generated {time.strftime("%Y-%m-%d %H:%M:%S")} from {escape(ds.describe())}</small></footer>\n'
+        '</body>\n</html>\n'
+    )
+
+
+_plotly_js_cache = None
+
+
+def _plotly_js():
+    global _plotly_js_cache
+    if _plotly_js_cache is None:
+        _plotly_js_cache = get_plotlyjs()
+    return _plotly_js_cache
+
+
+def report_filename(position_id, business_date):
+    return re.sub(r'[^\w.-]+', '_', f'{position_id}_{business_date}') + '.html'
+
+
+def _write_report(task):
+    position_id, business_date, out_dir, plotlyjs = task
+    start = time.perf_counter()
+    try:
+        document = render_report(position_id, business_date, plotlyjs)
+    except Exception as e:
+        return position_id, business_date, None, 0, time.perf_counter() - start, f'{type(e).__name__}: {e}'
+    path = os.path.join(out_dir, report_filename(position_id, business_date))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(document)
+    return position_id, business_date, path, len(document), time.perf_counter() - start, None
+
+
+def render_reports(positions, out_dir, workers=None, plotlyjs='inline'):
+    """
+    Render a report per (position, business date) into `out_dir`.
+    Returns the per-report results and the batch throughput.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    tasks = [(pid, date, out_dir, plotlyjs) for pid, date in positions]
+    if plotlyjs == 'inline':
+        # Loaded once here, so forked workers inherit it
+        _plotly_js()
+
+    # Forked workers share the parent's dataset; elsewhere each worker loads
+    # its own when it imports this module
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_write_report(x) for x in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        with context.Pool(workers) as pool:
+            results = list(pool.imap_unordered(_write_report, tasks, chunksize=chunksize))
+    wall_time = time.perf_counter() - start
+
+    written = [x for x in results if x[2] is not None]
+    stats = {
+        'reports': len(written),
+        'errors': len(results) - len(written),
+        'workers': workers,
+        'wall_time': wall_time,
+        'reports_per_second': len(written) / wall_time if wall_time else float('nan'),
+        'bytes': sum(x[3] for x in written),
+        'mean_render_time': sum(x[4] for x in written) / len(written) if written else float('nan'),
+    }
+    return results, stats
+
+
+def flagged_positions(business_date=None):
+    flagged = dl.current().break_detector.flagged(business_date)
+    return list(flagged[['Position ID', 'Business Date']].drop_duplicates().itertuples(index=False, name=None))
+
+
+def latest_positions():
+    ds = dl.current()
+    df = ds.source.frame(columns=['Position ID', 'Business Date'])
+    latest = df.sort_values('Business Date', kind='mergesort').drop_duplicates('Position ID', keep='last')
+    return list(latest.sort_values('Position ID').itertuples(index=False, name=None))
+
+
+def read_positions(path):
+    with open(path, newline='') as f:
+        rows = [x for x in csv.reader(f) if x]
+    if rows and rows[0][:2] == ['Position ID', 'Business Date']:
+        rows = rows[1:]
+    return [(x[0].strip(), x[1].strip()) for x in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1].strip())
+    which = parser.add_mutually_exclusive_group(required=True)
+    which.add_argument('--positions', help="CSV of Position ID,Business Date pairs")
+    which.add_argument('--flagged', nargs='?', const='', metavar='DATE',
+                       help="Positions flagged as breaks on DATE (all dates if omitted)")
+    which.add_argument('--all', action='store_true', help="Every position on its latest business date")
+    parser.add_argument('--out', default='reports', help="Output directory (default ./reports)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--plotlyjs', choices=['inline', 'cdn'], default='inline',
+                        help="Embed plotly.js in every report (offline) or load it from the CDN")
+    parser.add_argument('--json', action='store_true', help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    if args.positions:
+        positions = read_positions(args.positions)
+    elif args.all:
+        positions = latest_positions()
+    else:
+        positions = flagged_positions(args.flagged or None)
+
+    results, stats = render_reports(positions, args.out, args.workers, args.plotlyjs)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        for pid, date, _, _, _, error in results:
+            if error:
+                print(f"FAILED {pid} {date}: {error}")
+        print(f"{stats['reports']} reports ({stats['errors']} failed) in {stats['wall_time']:.2f}s "
+              f"on {stats['workers']} workers: {stats['reports_per_second']:.1f} reports/s, "
+              f"{stats['mean_render_time'] * 1000:.0f} ms per report, {stats['bytes'] / 2**20:.1f} MB written "
+              f"to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
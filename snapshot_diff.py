@@ -0,0 +1,191 @@
+# dash_multi_tab_dashboard/snapshot_diff.py
+import numpy as np
+import pandas as pd
+
+
+KEY_COLUMNS = ['Position ID', 'Business Date']
+
+# Numeric cells are equal if |old - new| <= ATOL + RTOL * |new|
+DEFAULT_RTOL = 1e-9
+DEFAULT_ATOL = 1e-6
+
+# Rows of each version diffed at a time by diff_scans
+DIFF_BATCH_ROWS = 50_000
+
+
+class SnapshotDiff:
+    """
+    Cell-level differences between two versions of the dataset.
+
+    `rows` holds the changed, added and removed rows in the grid's record layout:
+    the new values (old values for removed rows) plus
+      _status   'changed', 'added' or 'removed'
+      _changed  names of the changed columns
+      _old      {column: old value} for the changed cells
+    """
+
+    def __init__(self, rows, changed_counts, n_matched):
+        self.rows = rows
+        self.changed_counts = changed_counts
+        self.n_matched = n_matched
+
+    def summary(self):
+        status = self.rows['_status'].value_counts()
+        return {
+            'matched': self.n_matched,
+            'changed': int(status.get('changed', 0)),
+            'added': int(status.get('added', 0)),
+            'removed': int(status.get('removed', 0)),
+            'changed_cells': int(self.changed_counts.sum()),
+        }
+
+
+def _align(old, new):
+    """Hash join on the key columns; for each new row, the position of its old row or -1"""
+    old_index = pd.MultiIndex.from_frame(old[KEY_COLUMNS])
+    new_index = pd.MultiIndex.from_frame(new[KEY_COLUMNS])
+    return old_index.get_indexer(new_index)
+
+
+def _changed_numeric(old_values, new_values, rtol, atol):
+    old_values = old_values.astype(float, copy=False)
+    new_values = new_values.astype(float, copy=False)
+    same = np.isclose(old_values, new_values, rtol=rtol, atol=atol, equal_nan=True)
+    return ~same
+
+
+def _changed_other(old_values, new_values):
+    old_null = pd.isna(old_values)
+    new_null = pd.isna(new_values)
+    with np.errstate(invalid='ignore'):
+        differ = old_values != new_values
+    return np.where(old_null | new_null, old_null != new_null, differ)
+
+
+def diff_snapshots(old, new, rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL):
+    """
+    Compare two snapshots aligned on (Position ID, Business Date).
+
+    Every column present in both is compared as a whole array: all numeric
+    columns together in one 2D comparison with NaN == NaN and the given
+    tolerance, the remaining columns with null-aware equality.
+    """
+    old = old.drop_duplicates(KEY_COLUMNS, keep='last').reset_index(drop=True)
+    new = new.drop_duplicates(KEY_COLUMNS, keep='last').reset_index(drop=True)
+
+    old_pos = _align(old, new)
+    matched = old_pos >= 0
+    new_rows = np.flatnonzero(matched)
+    old_rows = old_pos[matched]
+
+    columns = [x for x in new.columns if x in old.columns and x not in KEY_COLUMNS]
+    numeric = [
+        x for x in columns
+        if pd.api.types.is_numeric_dtype(old[x]) and pd.api.types.is_numeric_dtype(new[x])
+    ]
+    other = [x for x in columns if x not in numeric]
+
+    changed = np.zeros((len(new_rows), len(columns)), dtype=bool)
+    if numeric:
+        changed[:, :len(numeric)] = _changed_numeric(
+            old[numeric].to_numpy()[old_rows], new[numeric].to_numpy()[new_rows], rtol, atol
+        )
+    if other:
+        changed[:, len(numeric):] = _changed_other(
+            old[other].to_numpy(dtype=object)[old_rows], new[other].to_numpy(dtype=object)[new_rows]
+        )
+    columns = numeric + other
+
+    # Collect the changed columns and their old values, row by row
+    row_has_change = changed.any(axis=1)
+    changed_rows = np.flatnonzero(row_has_change)
+    row_idx, col_idx = np.nonzero(changed[changed_rows])
+    splits = np.searchsorted(row_idx, np.arange(1, len(changed_rows)))
+    col_names = np.array(columns, dtype=object)
+    old_block = old[columns].to_numpy(dtype=object)[old_rows[changed_rows]]
+
+    changed_cols = []
+    old_values = []
+    for i, cols in enumerate(np.split(col_idx, splits) if len(changed_rows) else []):
+        changed_cols.append(col_names[cols].tolist())
+        old_values.append(dict(zip(changed_cols[-1], old_block[i, cols].tolist())))
+
+    parts = [
+        new.iloc[new_rows[changed_rows]].assign(_status='changed', _changed=changed_cols, _old=old_values),
+        new.iloc[np.flatnonzero(~matched)].assign(_status='added', _changed=None, _old=None),
+    ]
+    removed = np.ones(len(old), dtype=bool)
+    removed[old_rows] = False
+    parts.append(old.iloc[np.flatnonzero(removed)].assign(_status='removed', _changed=None, _old=None))
+
+    rows = pd.concat(parts, ignore_index=True)
+    return SnapshotDiff(
+        rows,
+        changed_counts=pd.Series(changed.sum(axis=0), index=columns),
+        n_matched=int(matched.sum()),
+    )
+
+
+def _paired_dates(old_frames, new_frames):
+    """
+    (old, new) frames covering the same business dates, from two streams of
+    whole-date frames in date order. Only the frames not yet paired are held.
+    """
+    streams = [iter(old_frames), iter(new_frames)]
+    buffers = [[], []]
+    reached = [None, None]  # latest Business Date read from each stream
+    done = [False, False]
+    while not all(done):
+        # Read on from the stream that is behind
+        i = min((k for k in (0, 1) if not done[k]), key=lambda k: reached[k] or '')
+        frame = next(streams[i], None)
+        if frame is None:
+            done[i] = True
+        elif len(frame):
+            buffers[i].append(frame)
+            reached[i] = max(reached[i] or '', frame['Business Date'].max())
+
+        if all(done):
+            if buffers[0] or buffers[1]:
+                yield [pd.concat(x, ignore_index=True) if x else None for x in buffers]
+            return
+        # Dates up to the earliest date reached by a stream still being read are complete in both
+        pending = [reached[k] for k in (0, 1) if not done[k]]
+        if None in pending:
+            continue
+        complete = min(pending)
+
+        pair = []
+        for k in (0, 1):
+            if not buffers[k]:
+                pair.append(None)
+                continue
+            df = pd.concat(buffers[k], ignore_index=True)
+            ready = (df['Business Date'] <= complete).to_numpy()
+            pair.append(df[ready] if ready.any() else None)
+            buffers[k] = [] if ready.all() else [df[~ready]]
+        if pair[0] is not None or pair[1] is not None:
+            yield pair
+
+
+def diff_scans(old_frames, new_frames, old_schema, new_schema, rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL):
+    """
+    diff_snapshots of two datasets streamed as whole-date frames in date order
+    (DataSource.scan), a few business dates at a time. Rows only match within
+    a business date, so the result is the same as diffing them whole.
+    `old_schema` and `new_schema` are empty frames with each side's columns.
+    """
+    parts = [
+        diff_snapshots(old_schema if old is None else old, new_schema if new is None else new, rtol, atol)
+        for old, new in _paired_dates(old_frames, new_frames)
+    ] or [diff_snapshots(old_schema, new_schema, rtol, atol)]
+
+    rows = pd.concat([x.rows for x in parts], ignore_index=True)
+    # Changed rows first, then added, then removed, as for a single diff
+    rank = rows['_status'].map({'changed': 0, 'added': 1, 'removed': 2}).to_numpy()
+    changed_counts = pd.concat([x.changed_counts for x in parts], axis=1).sum(axis=1).astype(int)
+    return SnapshotDiff(
+        rows.iloc[np.argsort(rank, kind='stable')].reset_index(drop=True),
+        changed_counts=changed_counts,
+        n_matched=sum(x.n_matched for x in parts),
+    )
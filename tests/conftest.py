@@ -0,0 +1,9 @@
+# dash_multi_tab_dashboard/tests/conftest.py
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# data_loader loads the dataset on import; serve the one shipped with the repo
+os.environ.setdefault('DASHBOARD_DATA_FILE', os.path.join(ROOT, 'financial_dataset_2025-06-01.csv'))
@@ -0,0 +1,125 @@
+# dash_multi_tab_dashboard/tests/test_column_stats.py
+"""
+The summaries are checked against exact answers: counts, nulls, min, max and
+mean exactly, quantiles within the rank error documented for the sketch
+size, for one stream, for merged partitions and for Asset Type / date range
+queries over ColumnStats.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import column_stats
+from column_stats import DEFAULT_K, ColumnStats, ColumnSummary, QuantileSketch
+
+
+QS = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+# Rank error documented next to DEFAULT_K
+RANK_ERROR = 1.7 / DEFAULT_K ** 0.9
+
+
+@pytest.fixture(autouse=True)
+def seeded(monkeypatch):
+    # The compactions pick a random half, fix it so a run is reproducible
+    monkeypatch.setattr(column_stats, '_rng', np.random.default_rng(7))
+
+
+def rank_errors(values, estimates, qs):
+    """|rank of each estimate - q|, as fractions of the data"""
+    values = np.sort(values[~np.isnan(values)])
+    ranks = np.searchsorted(values, estimates, side='right') / len(values)
+    return np.abs(ranks - np.asarray(qs))
+
+
+def test_single_stream_quantiles():
+    values = np.random.default_rng(0).normal(size=300_000)
+    sketch = QuantileSketch()
+    for chunk in np.array_split(values, 37):
+        sketch.update(chunk)
+    assert sketch.n == len(values)
+    assert rank_errors(values, sketch.quantiles(QS), QS).max() <= RANK_ERROR
+    # Far fewer items than values are kept
+    assert sketch.nbytes < values.nbytes / 50
+
+
+def test_merged_partitions_match_single_stream():
+    rng = np.random.default_rng(1)
+    # Partitions of different sizes and distributions
+    parts = [rng.normal(loc=i % 7, scale=1 + i % 3, size=rng.integers(100, 20_000)) for i in range(60)]
+    values = np.concatenate(parts)
+    sketches = [QuantileSketch().update(x) for x in parts]
+    levels = [[y.copy() for y in x.levels] for x in sketches]
+
+    merged = QuantileSketch.merged(sketches)
+    single = QuantileSketch().update(values)
+    assert merged.n == single.n == len(values)
+    assert rank_errors(values, merged.quantiles(QS), QS).max() <= RANK_ERROR
+    assert rank_errors(values, single.quantiles(QS), QS).max() <= RANK_ERROR
+    # The partition sketches are left as they were
+    for sketch, before in zip(sketches, levels):
+        assert all(np.array_equal(x, y) for x, y in zip(sketch.levels, before))
+
+
+def test_summary_of_nulls_and_empty():
+    summary = ColumnSummary().update([np.nan, 1.0, np.nan, 3.0]).result()
+    assert (summary['Count'], summary['Nulls'], summary['Min'], summary['Max'], summary['Mean']) == (2, 2, 1, 3, 2)
+
+    empty = ColumnSummary.merged([ColumnSummary().update([np.nan])]).result()
+    assert empty['Count'] == 0 and empty['Nulls'] == 1
+    assert all(np.isnan(empty[x]) for x in ['Min', 'Mean', 'Max', 'P1', 'P50', 'P99'])
+
+
+def make_book():
+    rng = np.random.default_rng(2)
+    n = 120_000
+    dates = np.array([d.strftime('%Y-%m-%d') for d in pd.bdate_range('2024-01-02', periods=20)])
+    df = pd.DataFrame({
+        'Business Date': dates[rng.integers(0, len(dates), n)],
+        'Asset Type': np.array(['Equity', 'Bond', 'Option'])[rng.integers(0, 3, n)],
+        'CleanPnL': rng.normal(0, 1000, n).round(2),
+        'RTPL': rng.lognormal(5, 1, n),
+    })
+    df.loc[rng.random(n) < 0.1, 'RTPL'] = np.nan
+    return df
+
+
+@pytest.fixture(scope='module')
+def book():
+    return make_book()
+
+
+@pytest.mark.parametrize('asset_type,start,end', [
+    (None, None, None),
+    ('Bond', None, None),
+    (None, '2024-01-10', '2024-01-19'),
+    ('Option', '2024-01-05', '2024-01-05'),
+])
+def test_column_stats_queries(book, asset_type, start, end):
+    stats = ColumnStats(['CleanPnL', 'RTPL'])
+    # Streamed a few dates at a time and one column at a time, as at load
+    for _, part in book.groupby(book['Business Date'] >= '2024-01-15'):
+        stats.update(part[['Business Date', 'Asset Type', 'CleanPnL']])
+        stats.update(part[['Business Date', 'Asset Type', 'RTPL']])
+    assert stats.asset_types == ['Bond', 'Equity', 'Option']
+    assert stats.business_dates == sorted(book['Business Date'].unique())
+
+    selected = book[book['Business Date'].between(start or '', end or '9999')]
+    if asset_type:
+        selected = selected[selected['Asset Type'] == asset_type]
+    summary = stats.summary(asset_type, start, end).set_index('Column')
+    for col in ['CleanPnL', 'RTPL']:
+        values = selected[col].to_numpy()
+        row = summary.loc[col]
+        assert row['Count'] == np.count_nonzero(~np.isnan(values))
+        assert row['Nulls'] == np.count_nonzero(np.isnan(values))
+        assert row['Min'] == np.nanmin(values) and row['Max'] == np.nanmax(values)
+        assert row['Mean'] == pytest.approx(np.nanmean(values), rel=1e-12)
+        qs = list(column_stats.SUMMARY_QUANTILES.values())
+        assert rank_errors(values, row[list(column_stats.SUMMARY_QUANTILES)].to_numpy(float), qs).max() \
+            <= RANK_ERROR
+
+
+def test_column_stats_empty_selection(book):
+    stats = ColumnStats(['CleanPnL']).update(book)
+    row = stats.summary('Swap').iloc[0]
+    assert row['Count'] == 0 and row['Nulls'] == 0 and np.isnan(row['P50'])
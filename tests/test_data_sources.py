@@ -0,0 +1,175 @@
+# dash_multi_tab_dashboard/tests/test_data_sources.py
+"""
+Every backend has to answer grid pages, filters and aggregations the same
+way. The same small book is served from memory (whole and under a memory
+budget), Parquet, SQLite and DuckDB, and the results are compared.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_sources import MemorySource, open_source, write_source
+from history_store import HistoryStore
+
+
+BACKENDS = ['memory', 'memory-budget', 'parquet', 'sqlite', 'duckdb']
+
+
+def make_book():
+    rng = np.random.default_rng(0)
+    dates = [d.strftime('%Y-%m-%d') for d in pd.bdate_range('2024-01-02', periods=12)]
+    rows = []
+    for asset_type in ['Equity', 'Bond', 'Option']:
+        for i in range(8):
+            # Some positions start late, so dates have different row counts
+            for business_date in dates[i % 3:]:
+                rows.append({
+                    'Position ID': f'{asset_type}_{i:04d}',
+                    'Business Date': business_date,
+                    'Asset Type': asset_type,
+                    'CleanPnL': round(rng.normal(0, 1000), 2),
+                    'RTPL': np.nan if rng.random() < 0.2 else round(rng.normal(0, 1000), 2),
+                    'Settings[A]': None if rng.random() < 0.2 else str(rng.choice(['Alpha', 'beta', 'GAMMA'])),
+                })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope='module')
+def book():
+    return make_book()
+
+
+@pytest.fixture(scope='module', params=BACKENDS)
+def source(request, book, tmp_path_factory):
+    path = tmp_path_factory.mktemp(request.param)
+    if request.param == 'memory':
+        src = MemorySource(HistoryStore(book))
+    elif request.param == 'memory-budget':
+        # Room for about three business dates, the rest is spilled
+        row_bytes = book.memory_usage(deep=True).sum() / len(book)
+        src = MemorySource(HistoryStore(book, budget_bytes=int(row_bytes * 70), spill_dir=str(path)))
+        assert src.store.spilled
+    else:
+        if request.param == 'duckdb':
+            pytest.importorskip('duckdb')
+        url = f'{request.param}:///{path / "book"}'
+        write_source(book, url)
+        src = open_source(url)
+    yield src
+    src.close()
+
+
+def normalized(df, columns):
+    """Rows as comparable tuples, with nulls of every kind as None"""
+    df = df[columns].astype(object)
+    return [tuple(None if pd.isna(x) else x for x in row) for row in df.itertuples(index=False)]
+
+
+def expected_page(book, start, end, sort_model, filters):
+    df = filters(book) if filters else book
+    keys = [x['colId'] for x in sort_model or []]
+    if keys:
+        df = df.sort_values(keys, ascending=[x['sort'] == 'asc' for x in sort_model],
+                            kind='mergesort', na_position='last')
+    return df.iloc[start:end], len(df)
+
+
+SORTS = [
+    None,
+    [{'colId': 'CleanPnL', 'sort': 'desc'}],
+    # Mostly ties, whose order must hold from one block to the next
+    [{'colId': 'Asset Type', 'sort': 'asc'}],
+    [{'colId': 'Asset Type', 'sort': 'asc'}, {'colId': 'RTPL', 'sort': 'asc'}, {'colId': 'CleanPnL', 'sort': 'asc'}],
+]
+
+FILTERS = [
+    (None, None),
+    ({'Asset Type': {'filterType': 'text', 'type': 'equals', 'filter': 'bond'}},
+     lambda df: df[df['Asset Type'] == 'Bond']),
+    ({'Settings[A]': {'filterType': 'text', 'type': 'notEqual', 'filter': 'Beta'}},
+     lambda df: df[df['Settings[A]'].str.lower() != 'beta']),
+    ({'CleanPnL': {'filterType': 'number', 'type': 'greaterThan', 'filter': 0}},
+     lambda df: df[df['CleanPnL'] > 0]),
+    ({'Settings[A]': {'filterType': 'text', 'type': 'contains', 'filter': 'a'}},
+     lambda df: df[df['Settings[A]'].str.lower().str.contains('a', na=False)]),
+    ({'Settings[A]': {'filterType': 'text', 'type': 'notContains', 'filter': 'alpha'}},
+     lambda df: df[~df['Settings[A]'].str.lower().str.contains('alpha', na=False)]),
+    ({'RTPL': {'filterType': 'number', 'type': 'blank'}},
+     lambda df: df[df['RTPL'].isna()]),
+    ({'Business Date': {'filterType': 'date', 'type': 'inRange',
+                        'dateFrom': '2024-01-04 00:00:00', 'dateTo': '2024-01-10 00:00:00'}},
+     lambda df: df[df['Business Date'].between('2024-01-04', '2024-01-10')]),
+    ({'CleanPnL': {'filterType': 'number', 'operator': 'OR', 'conditions': [
+        {'filterType': 'number', 'type': 'lessThan', 'filter': -500},
+        {'filterType': 'number', 'type': 'greaterThanOrEqual', 'filter': 500},
+    ]}}, lambda df: df[(df['CleanPnL'] < -500) | (df['CleanPnL'] >= 500)]),
+]
+
+
+@pytest.mark.parametrize('sort_model', SORTS)
+@pytest.mark.parametrize('filter_model,filters', FILTERS)
+def test_page(source, book, sort_model, filter_model, filters):
+    columns = list(book.columns)
+    for start, end in [(0, 25), (25, 50), (150, 250)]:
+        df, total = source.page(start, end, sort_model, filter_model, columns=columns)
+        expected, expected_total = expected_page(book, start, end, sort_model, filters)
+        assert total == expected_total
+        keys = [x['colId'] for x in sort_model or []]
+        if keys and not book.duplicated(keys).any():
+            assert normalized(df, columns) == normalized(expected, columns)
+        elif keys:
+            # Tied rows come in each backend's own storage order
+            assert normalized(df, keys) == normalized(expected, keys)
+            assert set(normalized(df, columns)) <= set(normalized(book, columns))
+        else:
+            # Unsorted pages come in each backend's own row order, check them as sets
+            assert len(df) == len(expected)
+            assert set(normalized(df, columns)) <= set(normalized(filters(book) if filters else book, columns))
+
+
+@pytest.mark.parametrize('sort_model', [None, [{'colId': 'Asset Type', 'sort': 'asc'}]])
+def test_pages_cover_every_row(source, book, sort_model):
+    columns = ['Position ID', 'Business Date']
+    pages = [
+        source.page(start, start + 100, sort_model, columns=columns)[0]
+        for start in range(0, len(book), 100)
+    ]
+    assert sorted(normalized(pd.concat(pages), columns)) == sorted(normalized(book, columns))
+
+
+def test_frame_predicates(source, book):
+    predicates = [
+        {'column': 'Asset Type', 'op': '!=', 'value': 'Equity'},
+        {'or': [
+            {'column': 'Settings[A]', 'op': 'startswith', 'value': 'al'},
+            {'column': 'Settings[A]', 'op': 'endswith', 'value': 'MA'},
+            {'column': 'RTPL', 'op': 'is_null', 'value': None},
+        ]},
+    ]
+    columns = ['Position ID', 'Business Date', 'RTPL']
+    text = book['Settings[A]'].str.lower()
+    expected = book[
+        (book['Asset Type'] != 'Equity')
+        & (text.str.startswith('al', na=False) | text.str.endswith('ma', na=False) | book['RTPL'].isna())
+    ]
+    assert sorted(normalized(source.frame(columns, predicates), columns)) == \
+        sorted(normalized(expected, columns))
+
+
+def test_aggregate(source, book):
+    result = source.aggregate(['Asset Type'], {'CleanPnL': ['sum', 'count'], 'RTPL': ['mean']})
+    expected = book.groupby('Asset Type').agg({'CleanPnL': ['sum', 'count'], 'RTPL': ['mean']})
+    assert list(result['Asset Type']) == list(expected.index)
+    np.testing.assert_allclose(result['CleanPnL_sum'], expected[('CleanPnL', 'sum')])
+    np.testing.assert_array_equal(result['CleanPnL_count'], expected[('CleanPnL', 'count')])
+    np.testing.assert_allclose(result['RTPL_mean'], expected[('RTPL', 'mean')])
+
+
+def test_position_lookups(source, book):
+    history = source.position_history('Bond_0001')
+    expected = book[book['Position ID'] == 'Bond_0001']
+    assert list(history['Business Date']) == list(expected['Business Date'])
+
+    business_date = expected['Business Date'].iloc[0]
+    row = source.row('Bond_0001', business_date)
+    assert len(row) == 1 and row['CleanPnL'].iloc[0] == expected['CleanPnL'].iloc[0]
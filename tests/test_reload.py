@@ -0,0 +1,100 @@
+# dash_multi_tab_dashboard/tests/test_reload.py
+"""
+A reloaded dataset carries the break detector over from the previous version
+only when the dates it scored are unchanged; it has to end up with the same
+scores as loading the new file from scratch.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import breaks
+import data_loader as dl
+from data_sources import MemorySource
+from history_store import HistoryStore
+
+
+def make_book(dates=30, positions=6):
+    rng = np.random.default_rng(1)
+    rows = []
+    for business_date in pd.bdate_range('2024-01-02', periods=dates).strftime('%Y-%m-%d'):
+        for i in range(positions):
+            clean = rng.normal(0, 1000)
+            rows.append({
+                'Position ID': f'Equity_{i:04d}',
+                'Business Date': business_date,
+                'Asset Type': 'Equity',
+                'CleanPnL': round(clean, 2),
+                'RTPL': round(clean + rng.normal(0, 50), 2),
+            })
+    return pd.DataFrame(rows)
+
+
+def load(df, version=1, previous=None):
+    return dl.Dataset(MemorySource(HistoryStore(df)), version, previous)
+
+
+def scores(dataset):
+    return (
+        dataset.break_detector.scores
+        .sort_values(['Position ID', 'Business Date'])
+        .reset_index(drop=True)
+    )
+
+
+@pytest.fixture
+def fed_rows(monkeypatch):
+    """Rows fed to BreakDetector.update"""
+    rows = []
+    update = breaks.BreakDetector.update
+
+    def counting_update(self, df):
+        rows.append(len(df))
+        return update(self, df)
+
+    monkeypatch.setattr(breaks.BreakDetector, 'update', counting_update)
+    return rows
+
+
+def test_new_dates_only_score_the_new_rows(fed_rows):
+    book = make_book()
+    last_date = book['Business Date'].max()
+    previous = load(book[book['Business Date'] < last_date])
+
+    fed_rows.clear()
+    reloaded = load(book, 2, previous)
+    assert sum(fed_rows) == (book['Business Date'] == last_date).sum()
+    pd.testing.assert_frame_equal(scores(reloaded), scores(load(book)))
+
+
+def restate_rtpl(df):
+    # A large restatement on the latest date, big enough to be flagged
+    df = df.copy()
+    row = (df['Position ID'] == 'Equity_0003') & (df['Business Date'] == df['Business Date'].max())
+    df.loc[row, 'RTPL'] += 1e6
+    return df
+
+
+def drop_position(df):
+    return df[df['Position ID'] != 'Equity_0002']
+
+
+def drop_date(df):
+    return df[df['Business Date'] != sorted(df['Business Date'].unique())[10]]
+
+
+@pytest.mark.parametrize('change', [restate_rtpl, drop_position, drop_date])
+@pytest.mark.parametrize('append', [False, True])
+def test_restated_dates_are_rescored(change, append):
+    book = make_book()
+    last_date = book['Business Date'].max()
+    old = book[book['Business Date'] < last_date] if append else book
+    previous = load(old)
+
+    new = change(book if append else old)
+    reloaded = load(new, 2, previous)
+    full = load(new)
+    pd.testing.assert_frame_equal(scores(reloaded), scores(full))
+    pd.testing.assert_frame_equal(reloaded.break_detector.flagged(), full.break_detector.flagged())
+    if change is restate_rtpl:
+        assert 'Equity_0003' in set(reloaded.break_detector.flagged(last_date)['Position ID'])
@@ -0,0 +1,146 @@
+# dash_multi_tab_dashboard/tests/test_snapshot_diff.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_sources import MemorySource
+from history_store import HistoryStore
+from snapshot_diff import diff_scans, diff_snapshots
+
+
+def make_snapshot():
+    return pd.DataFrame({
+        'Position ID': ['A', 'B', 'C', 'A', 'B', 'C'],
+        'Business Date': ['2024-01-02'] * 3 + ['2024-01-03'] * 3,
+        'CleanPnL': [100.0, np.nan, 300.0, 110.0, 210.0, 310.0],
+        'Settings[A]': ['X', None, 'Z', 'X', 'Y', None],
+    })
+
+
+def test_identical_snapshots():
+    diff = diff_snapshots(make_snapshot(), make_snapshot())
+    assert diff.rows.empty
+    assert diff.summary() == {'matched': 6, 'changed': 0, 'added': 0, 'removed': 0, 'changed_cells': 0}
+
+
+def test_nulls_equal_nulls():
+    old, new = make_snapshot(), make_snapshot()
+    # Same rows in another order, nulls in the same cells
+    diff = diff_snapshots(old, new.iloc[::-1])
+    assert diff.rows.empty
+
+    new.loc[1, 'CleanPnL'] = 200.0
+    new.loc[5, 'Settings[A]'] = 'Z'
+    new.loc[0, 'Settings[A]'] = None
+    diff = diff_snapshots(old, new)
+    changed = diff.rows.set_index('Position ID')
+    assert set(diff.rows['_status']) == {'changed'}
+    assert changed.loc['B', '_changed'] == ['CleanPnL'] and np.isnan(changed.loc['B', '_old']['CleanPnL'])
+    assert changed.loc['C', '_changed'] == ['Settings[A]'] and pd.isna(changed.loc['C', '_old']['Settings[A]'])
+    assert changed.loc['A', '_old'] == {'Settings[A]': 'X'}
+    assert diff.changed_counts.to_dict() == {'CleanPnL': 1, 'Settings[A]': 2}
+
+
+def test_tolerance():
+    old, new = make_snapshot(), make_snapshot()
+    new.loc[0, 'CleanPnL'] += 1e-8      # within atol + rtol * |new|
+    new.loc[2, 'CleanPnL'] *= 1 + 1e-12
+    new.loc[3, 'CleanPnL'] += 1e-3
+    diff = diff_snapshots(old, new)
+    assert list(diff.rows['Position ID']) == ['A']
+    assert diff.rows['Business Date'].iloc[0] == '2024-01-03'
+
+    assert diff_snapshots(old, new, atol=1e-2).rows.empty
+    assert len(diff_snapshots(old, new, rtol=0, atol=0).rows) == 3
+
+
+def test_added_removed_changed():
+    old, new = make_snapshot(), make_snapshot()
+    new = pd.concat([new[new['Position ID'] != 'C'], pd.DataFrame({
+        'Position ID': ['D'], 'Business Date': ['2024-01-03'], 'CleanPnL': [400.0], 'Settings[A]': ['W'],
+    })], ignore_index=True)
+    new.loc[new['Position ID'] == 'A', 'CleanPnL'] += 1
+
+    diff = diff_snapshots(old, new)
+    assert diff.summary() == {'matched': 4, 'changed': 2, 'added': 1, 'removed': 2, 'changed_cells': 2}
+    # Changed, then added, then removed; removed rows keep their old values
+    assert list(diff.rows['_status']) == ['changed', 'changed', 'added', 'removed', 'removed']
+    changed = diff.rows[diff.rows['_status'] == 'changed']
+    assert list(changed['CleanPnL']) == [101.0, 111.0]
+    assert [x['CleanPnL'] for x in changed['_old']] == [100.0, 110.0]
+    removed = diff.rows[diff.rows['_status'] == 'removed']
+    assert list(removed['Position ID']) == ['C', 'C'] and list(removed['CleanPnL']) == [300.0, 310.0]
+
+
+def test_duplicate_keys_keep_the_last_row():
+    old = make_snapshot()
+    new = pd.concat([old, old.iloc[[0]].assign(CleanPnL=999.0)], ignore_index=True)
+    diff = diff_snapshots(old, new)
+    assert diff.summary()['changed'] == 1 and diff.summary()['matched'] == 6
+    assert diff.rows['CleanPnL'].iloc[0] == 999.0
+
+
+def make_book(dates, seed):
+    rng = np.random.default_rng(seed)
+    rows = [
+        {'Position ID': f'P{i:03d}', 'Business Date': business_date,
+         'CleanPnL': float(rng.integers(0, 4)), 'Settings[A]': str(rng.choice(['X', 'Y']))}
+        for business_date in dates for i in range(20)
+    ]
+    return pd.DataFrame(rows)
+
+
+def batches(df, dates_per_batch):
+    """Whole-date frames in date order, as DataSource.scan yields them"""
+    dates = sorted(df['Business Date'].unique())
+    for i in range(0, len(dates), dates_per_batch):
+        yield df[df['Business Date'].isin(dates[i:i + dates_per_batch])]
+
+
+def comparable(diff):
+    rows = diff.rows.sort_values(['_status', 'Position ID', 'Business Date']).reset_index(drop=True)
+    return rows.astype(str), diff.changed_counts.sort_index().to_dict(), diff.summary()
+
+
+@pytest.mark.parametrize('old_batch,new_batch', [(1, 1), (1, 3), (4, 2), (100, 1)])
+def test_streamed_diff_matches_whole_diff(old_batch, new_batch):
+    dates = [d.strftime('%Y-%m-%d') for d in pd.bdate_range('2024-01-02', periods=10)]
+    # Dates only in the old version, only in the new one, and in both
+    old = make_book(dates[:8], seed=1)
+    new = make_book(dates[2:], seed=2)
+    expected = diff_snapshots(old, new)
+    assert expected.summary()['added'] and expected.summary()['removed'] and expected.summary()['changed']
+
+    streamed = diff_scans(batches(old, old_batch), batches(new, new_batch), old.iloc[:0], new.iloc[:0])
+    for x, y in zip(comparable(streamed), comparable(expected)):
+        if isinstance(x, pd.DataFrame):
+            pd.testing.assert_frame_equal(x, y)
+        else:
+            assert x == y
+
+
+def test_streamed_diff_of_empty_sides():
+    book = make_book(['2024-01-02', '2024-01-03'], seed=1)
+    assert diff_scans(iter([]), batches(book, 1), book.iloc[:0], book.iloc[:0]).summary()['added'] == 40
+    assert diff_scans(batches(book, 1), iter([]), book.iloc[:0], book.iloc[:0]).summary()['removed'] == 40
+    assert diff_scans(iter([]), iter([]), book.iloc[:0], book.iloc[:0]).rows.empty
+
+
+def test_streamed_diff_of_budgeted_sources(tmp_path):
+    dates = [d.strftime('%Y-%m-%d') for d in pd.bdate_range('2024-01-02', periods=10)]
+    old, new = make_book(dates, seed=1), make_book(dates, seed=2)
+    row_bytes = old.memory_usage(deep=True).sum() / len(old)
+    sources = [
+        MemorySource(HistoryStore(df, budget_bytes=int(row_bytes * 50), spill_dir=str(tmp_path / name)))
+        for name, df in (('old', old), ('new', new))
+    ]
+    assert all(x.store.spilled for x in sources)
+
+    streamed = diff_scans(sources[0].scan(batch_rows=30), sources[1].scan(batch_rows=30),
+                          sources[0].schema(), sources[1].schema())
+    rows, *summaries = comparable(streamed)
+    expected_rows, *expected_summaries = comparable(diff_snapshots(old, new))
+    pd.testing.assert_frame_equal(rows, expected_rows)
+    assert summaries == expected_summaries
+    for x in sources:
+        x.close()